@@ -0,0 +1,85 @@
+# config.py
+import os
+
+# Every category tab in the spreadsheet
+SHEET_NAMES = ["Kothi", "Apartment", "Floor", "Plot", "Rented", "Retail", "Office"]
+
+# Shared sheet cache: seconds a fetched sheet is served before it is refetched
+SHEET_CACHE_TTL = float(os.environ.get("SHEET_CACHE_TTL", 60))
+
+# Shared sheet cache: upper bound on cached entries, least recently used go first
+SHEET_CACHE_MAX_ENTRIES = int(os.environ.get("SHEET_CACHE_MAX_ENTRIES", 32))
+
+# Search results cache: recent searches whose matching rows are kept, least recently used go first
+FILTER_CACHE_MAX_ENTRIES = int(os.environ.get("FILTER_CACHE_MAX_ENTRIES", 256))
+
+# Search results: cards shown per page; only the current page is built and sent
+LISTINGS_PAGE_SIZE = int(os.environ.get("LISTINGS_PAGE_SIZE", 20))
+
+# Filter panels: default for new sessions of staging filter changes and applying them with
+# one submit, instead of rerunning on every change (agents can switch it in the sidebar)
+FILTER_FORM_MODE = os.environ.get("FILTER_FORM_MODE", "0") == "1"
+
+# Google Sheets: spreadsheet holding one tab per property category
+SPREADSHEET_ID = os.environ.get("SPREADSHEET_ID", "1yz74MaxJ-C5OfoSxfCQ7A9wtdlY-53PyBV3OmDiR0i8")
+
+# Google Sheets: service account key file
+SHEETS_CREDENTIALS_FILE = os.environ.get("SHEETS_CREDENTIALS_FILE", "keys.json")
+
+# Google Sheets: idle keep-alive connections kept for reuse, and socket timeout in seconds
+SHEETS_HTTP_POOL_SIZE = int(os.environ.get("SHEETS_HTTP_POOL_SIZE", 4))
+SHEETS_HTTP_TIMEOUT = float(os.environ.get("SHEETS_HTTP_TIMEOUT", 30))
+
+# Google Sheets: read requests per minute allowed by the quota, and how many may go out back to back
+SHEETS_READS_PER_MINUTE = float(os.environ.get("SHEETS_READS_PER_MINUTE", 60))
+SHEETS_READ_BURST = int(os.environ.get("SHEETS_READ_BURST", 10))
+
+# Google Sheets: attempts per request on 429/5xx or network errors, and the cap in seconds on one backoff
+SHEETS_RETRY_ATTEMPTS = int(os.environ.get("SHEETS_RETRY_ATTEMPTS", 5))
+SHEETS_RETRY_MAX_WAIT = float(os.environ.get("SHEETS_RETRY_MAX_WAIT", 16))
+
+# Where sheet rows come from: "sheets" (Google Sheets API) or a local "csv", "parquet" or "json" snapshot
+SHEET_DATA_SOURCE = os.environ.get("SHEET_DATA_SOURCE", "sheets")
+
+# Local snapshots: directory holding one <sheet name>.<format> file per category
+SHEET_DATA_DIR = os.environ.get("SHEET_DATA_DIR", "data")
+
+# On-disk Parquet snapshots of the last good read, served at startup while Google is refetched
+SHEET_SNAPSHOTS = os.environ.get("SHEET_SNAPSHOTS", "1" if SHEET_DATA_SOURCE == "sheets" else "0") == "1"
+SHEET_SNAPSHOT_DIR = os.environ.get("SHEET_SNAPSHOT_DIR", ".snapshots")
+
+
+def _parse_intervals(value):
+    # "Rented=60,Plot=900" -> {"Rented": 60.0, "Plot": 900.0}
+    intervals = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        sheet_name, seconds = item.split("=")
+        intervals[sheet_name.strip()] = float(seconds)
+    return intervals
+
+
+# Background refresher: polls every sheet off the request path and publishes new snapshots
+SHEET_REFRESHER = os.environ.get("SHEET_REFRESHER", "1") == "1"
+
+# Background refresher: seconds between polls, per sheet (Rented moves hourly, Plot rarely)
+SHEET_REFRESH_INTERVAL = float(os.environ.get("SHEET_REFRESH_INTERVAL", 120))
+SHEET_REFRESH_INTERVALS = {
+    "Rented": 60.0,
+    "Plot": 900.0,
+    **_parse_intervals(os.environ.get("SHEET_REFRESH_INTERVALS", "")),
+}
+
+# Incremental sync: sheets ("all" for every one) whose refreshes fetch only newly appended rows.
+# Download and DataFrame parse scale with the changes; category listings are still rebuilt whole
+SHEET_DELTA_SYNC = os.environ.get("SHEET_DELTA_SYNC", "")
+if SHEET_DELTA_SYNC == "all":
+    SHEET_DELTA_SYNC_SHEETS = list(SHEET_NAMES)
+else:
+    SHEET_DELTA_SYNC_SHEETS = [name.strip() for name in SHEET_DELTA_SYNC.split(",") if name.strip()]
+
+# Incremental sync: every Nth sync rereads the whole sheet to pick up edits to existing rows
+SHEET_DELTA_VERIFY_EVERY = int(os.environ.get("SHEET_DELTA_VERIFY_EVERY", 5))
+
+# Column selection: seconds after the last look at a listing's details before
+# refreshes stop downloading the detail-only columns again
+SHEET_DETAIL_IDLE_SECONDS = float(os.environ.get("SHEET_DETAIL_IDLE_SECONDS", 900))
@@ -0,0 +1,63 @@
+# counting_cache.py
+import threading
+
+from cachetools import LRUCache, TTLCache
+
+
+class _EvictionCounter:
+    # cachetools caches only call popitem() when they have to make room, so every call is an eviction
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.evictions = 0
+
+    def popitem(self):
+        item = super().popitem()
+        self.evictions += 1
+        return item
+
+
+class CountingLRUCache(_EvictionCounter, LRUCache):
+    pass
+
+
+class CountingTTLCache(_EvictionCounter, TTLCache):
+    pass
+
+
+class CountingCache:
+    """Thread-safe front for a counting cachetools cache, shared by every Streamlit session.
+
+    Counts hits and misses; ``stats()`` reports them with the evictions and size
+    of ``entries``, a CountingLRUCache or CountingTTLCache.
+    """
+
+    def __init__(self, entries):
+        self._lock = threading.Lock()
+        self._entries = entries
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self._entries.evictions,
+                "entries": len(self._entries),
+                "max_entries": self._entries.maxsize,
+            }
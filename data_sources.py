@@ -0,0 +1,249 @@
+# data_sources.py
+import argparse
+import csv
+import json
+import os
+import threading
+from collections import namedtuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from config import SHEET_DATA_SOURCE, SHEET_DATA_DIR, SHEET_NAMES
+from sheets_client import get_sheets_client, column_spans, quote_sheet, span_range
+
+
+def normalize_row(row):
+    # Match the Sheets API row format: every cell a string, trailing empty cells dropped
+    cells = ["" if value is None else str(value) for value in row]
+    while cells and cells[-1] == "":
+        cells.pop()
+    return cells
+
+
+# One read of a sheet: every column (columns=None) or only the given 0-based
+# positions, from start_row (1-based, the header is row 1) to the end. Reads
+# of selected columns that start at row 1 still return the full header row,
+# and cells outside the selection come back empty so positions are unchanged.
+SheetRead = namedtuple("SheetRead", ["sheet_name", "columns", "start_row"], defaults=(None, 1))
+
+
+def slice_read(data, read):
+    # Apply a SheetRead to rows that were read in full
+    rows = data[read.start_row - 1:]
+    if read.columns is None:
+        return [list(row) for row in rows]
+    selected = set(read.columns)
+    rows = [normalize_row(cell if i in selected else "" for i, cell in enumerate(row)) for row in rows]
+    if read.start_row == 1 and data:
+        rows[0] = list(data[0])
+    return rows
+
+
+class DataSource:
+    """Returns a sheet as a list of rows, header row first, like values().get does."""
+
+    def read(self, reads):
+        raise NotImplementedError
+
+    def fetch_sheet(self, sheet_name):
+        return self.read([SheetRead(sheet_name)])[0]
+
+    def fetch_sheets(self, sheet_names):
+        return self.read([SheetRead(sheet_name) for sheet_name in sheet_names])
+
+
+class GoogleSheetsDataSource(DataSource):
+    def read(self, reads):
+        # Every read becomes one or more A1 ranges of a single batchGet
+        ranges = []
+        plans = []
+        for read in reads:
+            if read.columns is None:
+                if read.start_row != 1:
+                    raise ValueError("Reads that skip rows must name their columns")
+                plans.append((len(ranges), None, None))
+                ranges.append(quote_sheet(read.sheet_name))
+                continue
+            header_at = None
+            if read.start_row == 1:
+                header_at = len(ranges)
+                ranges.append(f"{quote_sheet(read.sheet_name)}!1:1")
+            spans = column_spans(read.columns)
+            plans.append((len(ranges), header_at, spans))
+            ranges.extend(span_range(read.sheet_name, first, last, read.start_row) for first, last in spans)
+
+        values = get_sheets_client().batch_get_values(ranges) if ranges else []
+        results = []
+        for start, header_at, spans in plans:
+            if spans is None:
+                results.append(values[start])
+                continue
+            rows = _join_spans(spans, values[start:start + len(spans)])
+            if header_at is not None:
+                header = values[header_at][0] if values[header_at] else []
+                rows = [header] + rows[1:]
+            results.append(rows)
+        return results
+
+
+def _join_spans(spans, span_values):
+    # Lay the cells of each column run back at their sheet positions, row by row
+    height = max((len(rows) for rows in span_values), default=0)
+    joined = []
+    for i in range(height):
+        row = []
+        for (first, _), rows in zip(spans, span_values):
+            cells = rows[i] if i < len(rows) else []
+            if cells:
+                row.extend([""] * (first - len(row)))
+                row.extend(cells)
+        joined.append(normalize_row(row))
+    return joined
+
+
+class LocalFileDataSource(DataSource):
+    """One file per sheet in a directory; a missing file reads as an empty sheet."""
+
+    extension = None
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def path_for(self, sheet_name):
+        return os.path.join(self.directory, f"{sheet_name}.{self.extension}")
+
+    def fetch_sheet(self, sheet_name):
+        path = self.path_for(sheet_name)
+        if not os.path.exists(path):
+            return []
+        return [normalize_row(row) for row in self.read_rows(path)]
+
+    def read(self, reads):
+        # Files are read whole, once per sheet, then cut down to each read
+        sheets = {}
+        results = []
+        for read in reads:
+            if read.sheet_name not in sheets:
+                sheets[read.sheet_name] = self.fetch_sheet(read.sheet_name)
+            results.append(slice_read(sheets[read.sheet_name], read))
+        return results
+
+    def write_sheet(self, sheet_name, data):
+        os.makedirs(self.directory, exist_ok=True)
+        self.write_rows(self.path_for(sheet_name), data)
+
+    def read_rows(self, path):
+        raise NotImplementedError
+
+    def write_rows(self, path, data):
+        raise NotImplementedError
+
+
+class CsvDataSource(LocalFileDataSource):
+    extension = "csv"
+
+    def read_rows(self, path):
+        # The csv module keeps duplicate header names that pandas would rename
+        with open(path, newline="", encoding="utf-8") as f:
+            return list(csv.reader(f))
+
+    def write_rows(self, path, data):
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows(data)
+
+
+class JsonDataSource(LocalFileDataSource):
+    extension = "json"
+
+    def read_rows(self, path):
+        # Either the raw list of rows, or a list of records keyed by header
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data and isinstance(data[0], dict):
+            header = list(data[0].keys())
+            return [header] + [[record.get(column) for column in header] for record in data]
+        return data
+
+    def write_rows(self, path, data):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+
+
+class ParquetDataSource(LocalFileDataSource):
+    extension = "parquet"
+
+    def read_rows(self, path):
+        return table_to_rows(pq.ParquetFile(path).read())
+
+    def write_rows(self, path, data):
+        pq.write_table(rows_to_table(data), path)
+
+
+def rows_to_table(data):
+    # Sheet headers can repeat, so columns are stored by position and
+    # the header goes in as column names without going through pandas
+    header = data[0] if data else []
+    width = max((len(row) for row in data), default=0)
+    names = [header[i] if i < len(header) else "" for i in range(width)]
+    arrays = [
+        pa.array([row[i] if i < len(row) else None for row in data[1:]], type=pa.string())
+        for i in range(width)
+    ]
+    return pa.Table.from_arrays(arrays, names=names)
+
+
+def table_to_rows(table):
+    columns = [table.column(i).to_pylist() for i in range(table.num_columns)]
+    return [table.column_names] + [list(row) for row in zip(*columns)]
+
+
+DATA_SOURCES = {
+    "sheets": GoogleSheetsDataSource,
+    "csv": CsvDataSource,
+    "json": JsonDataSource,
+    "parquet": ParquetDataSource,
+}
+
+
+def create_data_source(kind, directory=SHEET_DATA_DIR):
+    if kind not in DATA_SOURCES:
+        raise ValueError(f"Unknown data source {kind!r}, expected one of {sorted(DATA_SOURCES)}")
+    if kind == "sheets":
+        return GoogleSheetsDataSource()
+    return DATA_SOURCES[kind](directory)
+
+
+_data_source = None
+_data_source_lock = threading.Lock()
+
+
+def get_data_source():
+    global _data_source
+    with _data_source_lock:
+        if _data_source is None:
+            _data_source = create_data_source(SHEET_DATA_SOURCE)
+        return _data_source
+
+
+def set_data_source(source):
+    # Swap the backend at runtime, e.g. for benchmarks against a local snapshot
+    global _data_source
+    with _data_source_lock:
+        _data_source = source
+
+
+def export_sheets(sheet_names, target, source=None):
+    # Copy sheets from one backend (Google Sheets by default) into a local one
+    source = source or GoogleSheetsDataSource()
+    for sheet_name, data in zip(sheet_names, source.fetch_sheets(sheet_names)):
+        target.write_sheet(sheet_name, data)
+
+
+if __name__ == "__main__":
+    # python data_sources.py --format parquet --dir data
+    parser = argparse.ArgumentParser(description="Snapshot the category sheets to local files")
+    parser.add_argument("--format", choices=["csv", "json", "parquet"], default="parquet")
+    parser.add_argument("--dir", default=SHEET_DATA_DIR)
+    args = parser.parse_args()
+    export_sheets(SHEET_NAMES, create_data_source(args.format, args.dir))
@@ -0,0 +1,111 @@
+# delta_sync.py
+import pandas as pd
+
+
+def _row_hash(row):
+    return hash(tuple(row))
+
+
+def _pad(row, width):
+    # DataFrame row: trimmed or padded with None to the header width
+    return list(row[:width]) + [None] * (width - len(row))
+
+
+class DeltaSheet:
+    """Rows, per-row hashes and the parsed DataFrame of one append-mostly sheet.
+
+    Most syncs read only the rows after the last known one. Every ``verify_every``
+    syncs, or whenever the selected columns change, the whole sheet is reread and
+    compared row by row, so edits to older rows are patched in too. Each sync
+    returns new ``data``/``frame`` objects and never modifies ones already handed
+    out, so published snapshots stay immutable. Only the download and the parse
+    into ``frame`` scale with the changes: the category pages' Listings are
+    still built from the whole frame (see ingest.build_listings).
+    """
+
+    def __init__(self, sheet_name, verify_every):
+        self.sheet_name = sheet_name
+        self.verify_every = verify_every
+        self.data = None
+        self.frame = None
+        self.columns = None
+        self._hashes = []
+        self._syncs_since_verify = 0
+        self.last_changes = {}
+
+    @property
+    def width(self):
+        return max((len(row) for row in self.data), default=0) if self.data else 0
+
+    def next_start_row(self, columns):
+        # Row the next read should start at: 1 rereads the whole sheet
+        if (
+            self.data is None
+            or columns != self.columns
+            or self._syncs_since_verify >= self.verify_every - 1
+        ):
+            return 1
+        return len(self.data) + 1
+
+    def apply(self, start_row, rows, columns):
+        # Merge the result of a read planned with next_start_row()
+        if start_row == 1:
+            if columns != self.columns:
+                # Different cells per row: nothing to compare against
+                self.data = None
+            self.columns = columns
+            self._sync_full(rows)
+        else:
+            self._sync_tail(rows)
+        return self.data, self.frame
+
+    def _sync_tail(self, tail):
+        self._syncs_since_verify += 1
+        self.last_changes = {"appended": len(tail), "edited": 0, "rebuilt": False}
+        if tail:
+            self._append(tail)
+
+    def _sync_full(self, data):
+        self._syncs_since_verify = 0
+        if not data:
+            # Keep the last good copy; the caller treats an empty read as a failure
+            self.last_changes = {"appended": 0, "edited": 0, "rebuilt": False}
+            return
+
+        # First load, a changed header or deleted rows: nothing to patch against
+        rows = data[1:]
+        if self.data is None or data[0] != self.data[0] or len(rows) < len(self._hashes):
+            self._rebuild(data)
+            return
+
+        hashes = [_row_hash(row) for row in rows[:len(self._hashes)]]
+        edited = [i for i, (old, new) in enumerate(zip(self._hashes, hashes)) if old != new]
+        tail = rows[len(self._hashes):]
+        self.last_changes = {"appended": len(tail), "edited": len(edited), "rebuilt": False}
+
+        if edited:
+            width = len(self.data[0])
+            frame = self.frame.copy()
+            frame.iloc[edited] = [_pad(rows[i], width) for i in edited]
+            new_data = list(self.data)
+            for i in edited:
+                new_data[i + 1] = rows[i]
+                self._hashes[i] = hashes[i]
+            self.data, self.frame = new_data, frame
+        if tail:
+            self._append(tail)
+
+    def _append(self, tail):
+        header = self.data[0]
+        appended = pd.DataFrame([_pad(row, len(header)) for row in tail], columns=header)
+        appended.index = pd.RangeIndex(len(self.frame), len(self.frame) + len(tail))
+        self.frame = pd.concat([self.frame, appended])
+        self.data = self.data + list(tail)
+        self._hashes = self._hashes + [_row_hash(row) for row in tail]
+
+    def _rebuild(self, data):
+        header = data[0]
+        self.data = data
+        self.frame = pd.DataFrame([_pad(row, len(header)) for row in data[1:]], columns=header)
+        self._hashes = [_row_hash(row) for row in data[1:]]
+        self.last_changes = {"appended": 0, "edited": 0, "rebuilt": True}
@@ -0,0 +1,30 @@
+# filter_cache.py
+from counting_cache import CountingCache, CountingLRUCache
+
+
+class FilterCache(CountingCache):
+    """Thread-safe LRU cache of search results shared by every Streamlit session.
+
+    Keys are (sheet name, listings version, FilterSpec); values are the matching
+    row positions, read-only. A new version of a sheet makes its older entries
+    unreachable, and ``evict_stale`` drops them.
+    """
+
+    def __init__(self, max_entries):
+        super().__init__(CountingLRUCache(maxsize=max_entries))
+        self.stale = 0
+
+    def set(self, key, rows):
+        rows.flags.writeable = False
+        super().set(key, rows)
+
+    def evict_stale(self, sheet_name, version):
+        # Drop the sheet's entries for every version but ``version``
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == sheet_name and key[1] != version]
+            for key in stale:
+                del self._entries[key]
+            self.stale += len(stale)
+
+    def stats(self):
+        return {**super().stats(), "stale": self.stale}
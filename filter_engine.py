@@ -0,0 +1,143 @@
+# filter_engine.py
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from config import FILTER_CACHE_MAX_ENTRIES
+from filter_cache import FilterCache
+from indexes import unpack_bitmap
+
+# Dropdown value meaning "no filter on this field"
+ALL = "All"
+
+# Matching rows of recent searches, shared by every session
+filter_results = FilterCache(max_entries=FILTER_CACHE_MAX_ENTRIES)
+
+# A search over one category's listings: ``equals`` is ((field, value), ...) and
+# ``ranges`` is ((field, (low, high)), ...), both sorted by field, so two specs
+# for the same search compare and hash equal however the page assembled them.
+# ``sort`` is (numeric field, descending), or None to keep the sheet's order
+# (best search matches first when there is a search). ``text`` is the search
+# box's query, lower-cased with its spacing collapsed, or "".
+FilterSpec = namedtuple("FilterSpec", ["equals", "ranges", "sort", "text"], defaults=(None, ""))
+
+
+def filter_spec(equals=None, ranges=None, sort=None, text=""):
+    # Fields left at ALL (or None) are dropped; range bounds are inclusive
+    equals = {field: value for field, value in (equals or {}).items() if value is not None and value != ALL}
+    ranges = {field: (low, high) for field, (low, high) in (ranges or {}).items()}
+    text = " ".join((text or "").lower().split())
+    return FilterSpec(tuple(sorted(equals.items())), tuple(sorted(ranges.items())), sort, text)
+
+
+def _equals_mask(column, value):
+    # Categoricals compare their integer codes against the one code for value
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        code = column.cat.categories.get_indexer([value])[0]
+        if code < 0:
+            return np.zeros(len(column), dtype=bool)
+        return column.cat.codes.to_numpy() == code
+    return column.to_numpy() == value
+
+
+def _equality_rows(listings, spec):
+    # Rows passing every equality filter, or None when there are none. Indexed
+    # fields are a bitwise AND of packed bitmaps, unpacked once at the end
+    frame = listings.frame
+    bits = None
+    unindexed = []
+    for field, value in spec.equals:
+        index = listings.bitmaps.get(field)
+        if index is None:
+            unindexed.append((field, value))
+        elif bits is None:
+            bits = index.lookup(value).copy()
+        else:
+            np.bitwise_and(bits, index.lookup(value), out=bits)
+    if bits is None and not unindexed:
+        return None
+    mask = np.ones(len(frame), dtype=bool) if bits is None else unpack_bitmap(bits, len(frame))
+    for field, value in unindexed:
+        mask &= _equals_mask(frame[field], value)
+    return np.flatnonzero(mask)
+
+
+def select_rows(listings, spec):
+    """Positions of the rows matching every filter of ``spec``, in the spec's order.
+
+    Each range is a slice of its field's SortedIndex, found by binary search. It
+    is intersected with the rows left so far by checking their values when they
+    are fewer, and through a scratch mask otherwise. The search query is looked
+    up in the TextIndex and merged in the same way. No intermediate frames are
+    built, and NaN never falls inside a range.
+    """
+    frame = listings.frame
+    rows = _equality_rows(listings, spec)
+    for field, (low, high) in spec.ranges:
+        in_range = listings.sorted_indexes[field].range(low, high)
+        if rows is None:
+            rows = np.sort(in_range)
+        elif len(rows) <= len(in_range):
+            values = frame[field].to_numpy()[rows].astype("float64")
+            rows = rows[(values >= low) & (values <= high)]
+        else:
+            keep = np.zeros(len(frame), dtype=bool)
+            keep[in_range] = True
+            rows = rows[keep[rows]]
+    scores = None
+    if spec.text:
+        rows, scores = _text_rows(listings, spec.text, rows)
+    if rows is None:
+        rows = np.arange(len(frame))
+    if spec.sort is not None:
+        field, descending = spec.sort
+        rows = listings.sorted_indexes[field].sort(rows, descending)
+    elif scores is not None:
+        rows = rows[np.argsort(-scores, kind="stable")]
+    return rows
+
+
+def _text_rows(listings, text, rows):
+    # The rows (of ``rows``, if given) matching the query, with their scores
+    if listings.text_index is None:
+        return np.array([], dtype=np.int64), np.array([])
+    matches, scores = listings.text_index.search(text)
+    if rows is None:
+        return matches, scores
+    # Both are in sheet order, so a kept row's score is found by binary search
+    rows = rows[np.isin(rows, matches, assume_unique=True)]
+    return rows, scores[np.searchsorted(matches, rows)]
+
+
+def cached_rows(listings, spec):
+    # select_rows, answered from filter_results when the same search ran on the same snapshot
+    key = (listings.sheet_name, listings.version, spec)
+    rows = filter_results.get(key)
+    if rows is None:
+        rows = select_rows(listings, spec)
+        filter_results.set(key, rows)
+    return rows
+
+
+def facet_counts(listings, spec, fields):
+    """Per field, how many rows each of its values would leave, the other filters unchanged.
+
+    For a field the rows matching every filter of ``spec`` except the field's
+    own are selected once (through the result cache), and its values among
+    them are counted in one pass: a bincount of the category codes, or a
+    value_counts for plain text. ``ALL`` maps to the number of those rows.
+    """
+    counts = {}
+    for field in fields:
+        others = spec._replace(equals=tuple(item for item in spec.equals if item[0] != field), sort=None)
+        rows = cached_rows(listings, others)
+        column = listings.frame[field]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            codes = column.cat.codes.to_numpy()[rows]
+            tally = np.bincount(codes[codes >= 0], minlength=len(column.cat.categories))
+            counts[field] = dict(zip(column.cat.categories, tally.tolist()))
+        else:
+            counts[field] = column.take(rows).value_counts().to_dict()
+        counts[field][ALL] = len(rows)
+    return counts
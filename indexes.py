@@ -0,0 +1,195 @@
+# indexes.py
+import re
+
+import numpy as np
+import pandas as pd
+
+# A bitmap index costs distinct values x rows / 8 bytes; fields with more values than
+# this are left unindexed and filtered by comparing their category codes instead
+BITMAP_MAX_VALUES = 256
+
+
+class BitmapIndex:
+    """Inverted index of one categorical column: value -> packed bitmap of its rows.
+
+    Bit i (``np.packbits`` order) is set when row position i holds the value, so
+    rows matching several values of different columns are the bitwise AND of
+    their bitmaps. Empty cells are in no bitmap.
+    """
+
+    def __init__(self, column):
+        self.size = len(column)
+        codes = column.cat.codes.to_numpy()
+        categories = column.cat.categories
+        # Rows grouped by code, so each value's rows are one slice of ``order``
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(categories) + 1))
+        self.bitmaps = {}
+        for code, value in enumerate(categories):
+            bits = np.zeros(self.size, dtype=bool)
+            bits[order[bounds[code]:bounds[code + 1]]] = True
+            self.bitmaps[value] = np.packbits(bits)
+        self._empty = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+
+    def lookup(self, value):
+        # Never modify the returned bitmap; it is shared by every session
+        return self.bitmaps.get(value, self._empty)
+
+    @property
+    def nbytes(self):
+        return sum(bitmap.nbytes for bitmap in self.bitmaps.values())
+
+
+def build_bitmap_indexes(frame, field_names):
+    # One index per categorical field with at most BITMAP_MAX_VALUES values, so no
+    # index outgrows BITMAP_MAX_VALUES x rows / 8 bytes; the rest are compared directly
+    return {
+        name: BitmapIndex(frame[name])
+        for name in field_names
+        if isinstance(frame[name].dtype, pd.CategoricalDtype)
+        and len(frame[name].cat.categories) <= BITMAP_MAX_VALUES
+    }
+
+
+def unpack_bitmap(bitmap, size):
+    # Packed bitmap -> boolean array of ``size`` rows
+    return np.unpackbits(bitmap, count=size).view(bool)
+
+
+class SortedIndex:
+    """Sort permutation of one numeric column, for range filters and ordering.
+
+    ``order`` lists the row positions of the non-empty values from smallest to
+    largest, so the rows within a range are one slice of it, found with two
+    binary searches. ``rank`` is each row's place in that order (equal values
+    share one), with empty values ranked last.
+    """
+
+    def __init__(self, column):
+        values = column.to_numpy(dtype="float64")
+        present = np.flatnonzero(~np.isnan(values))
+        self.order = present[np.argsort(values[present], kind="stable")]
+        self.sorted_values = values[self.order]
+        self.rank = np.full(len(values), len(values), dtype=np.int64)
+        self.rank[self.order] = np.searchsorted(self.sorted_values, self.sorted_values, side="left")
+
+    def range(self, low, high):
+        # Positions with low <= value <= high, in value order
+        start = np.searchsorted(self.sorted_values, low, side="left")
+        stop = np.searchsorted(self.sorted_values, high, side="right")
+        return self.order[start:stop]
+
+    def sort(self, positions, descending=False):
+        # positions reordered by value, ties in their given order; empty values stay last either way
+        ranks = self.rank[positions]
+        if descending:
+            ranks = np.where(ranks < len(self.rank), -ranks, ranks)
+        return positions[np.argsort(ranks, kind="stable")]
+
+    @property
+    def nbytes(self):
+        return self.order.nbytes + self.sorted_values.nbytes + self.rank.nbytes
+
+
+def build_sorted_indexes(frame, field_names):
+    return {name: SortedIndex(frame[name]) for name in field_names}
+
+
+class HierarchyIndex:
+    """Option lists of a chain of fields, such as micro market -> location -> project.
+
+    ``values`` has every field's values and ``children[(ancestor, field)]`` maps
+    each value of an ancestor to the field's values found under it, all in
+    sheet order, so a dependent dropdown narrows with one dictionary lookup.
+    """
+
+    def __init__(self, frame, levels):
+        self.levels = levels
+        self.values = {field: list(frame[field].dropna().unique()) for field in levels}
+        self.children = {}
+        for i, field in enumerate(levels):
+            for ancestor in levels[:i]:
+                pairs = frame[[ancestor, field]].dropna().drop_duplicates()
+                under = {}
+                for parent, child in zip(pairs[ancestor], pairs[field]):
+                    under.setdefault(parent, []).append(child)
+                self.children[(ancestor, field)] = under
+
+    def options(self, field, chosen):
+        # field's values under the nearest ancestor with a value in ``chosen`` (field -> value)
+        for ancestor in reversed(self.levels[:self.levels.index(field)]):
+            if ancestor in chosen:
+                return self.children[(ancestor, field)].get(chosen[ancestor], [])
+        return self.values[field]
+
+
+_WORD = r"[a-z0-9]+"
+
+
+def _words(text):
+    return re.findall(_WORD, text.lower())
+
+
+def _trigrams(word):
+    return {word[i:i + 3] for i in range(len(word) - 2)}
+
+
+class TextIndex:
+    """Inverted word index over a sheet's free-text fields, for the search box.
+
+    Each row's fields are split into lower-case words. ``vocabulary`` is the
+    sorted array of distinct words, and word i's postings (rows and counts) are
+    slice ``bounds[i]:bounds[i + 1]`` of ``rows`` and ``counts``. A query word
+    matches every word containing it, found through a trigram index of the
+    vocabulary, or every word it begins when it is under three letters long.
+    Matches are scored by TF-IDF.
+    """
+
+    def __init__(self, frame, fields):
+        self.size = len(frame)
+        text = pd.Series("", index=range(self.size), dtype="string")
+        for field in fields:
+            text = text + " " + frame[field].astype("string").fillna("").to_numpy()
+        words = text.str.lower().str.findall(_WORD).explode().dropna()
+        codes, vocabulary = pd.factorize(words.to_numpy(dtype=object), sort=True)
+        self.vocabulary = np.asarray(vocabulary, dtype=object)
+        # One entry per (word, row), grouped by word, with the word's count in the row
+        pairs, self.counts = np.unique(codes.astype(np.int64) * self.size + words.index.to_numpy(),
+                                       return_counts=True)
+        self.rows = pairs % self.size
+        self.bounds = np.searchsorted(pairs // self.size, np.arange(len(self.vocabulary) + 1))
+        self.idf = np.log((1 + self.size) / (1 + np.diff(self.bounds))) + 1
+        self.trigrams = {}
+        for word_id, word in enumerate(self.vocabulary):
+            for gram in _trigrams(word):
+                self.trigrams.setdefault(gram, []).append(word_id)
+
+    def _matching_words(self, term):
+        if len(term) < 3:
+            start = np.searchsorted(self.vocabulary, term, side="left")
+            stop = np.searchsorted(self.vocabulary, term + "\uffff", side="left")
+            return range(start, stop)
+        candidates = None
+        for gram in _trigrams(term):
+            found = set(self.trigrams.get(gram, ()))
+            candidates = found if candidates is None else candidates & found
+        return sorted(word_id for word_id in candidates if term in self.vocabulary[word_id])
+
+    def search(self, query):
+        # (row positions in sheet order, their scores) of the rows matching every word of query
+        total = np.zeros(self.size)
+        matched = np.ones(self.size, dtype=bool)
+        for term in _words(query):
+            score = np.zeros(self.size)
+            for word_id in self._matching_words(term):
+                start, stop = self.bounds[word_id], self.bounds[word_id + 1]
+                rows = self.rows[start:stop]
+                score[rows] += (1 + np.log(self.counts[start:stop])) * self.idf[word_id]
+            matched &= score > 0
+            total += score
+        rows = np.flatnonzero(matched)
+        return rows, total[rows]
+
+    @property
+    def nbytes(self):
+        return self.rows.nbytes + self.counts.nbytes + self.bounds.nbytes + self.idf.nbytes
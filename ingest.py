@@ -0,0 +1,132 @@
+# ingest.py
+import logging
+
+import pandas as pd
+
+from indexes import HierarchyIndex, TextIndex, build_bitmap_indexes, build_sorted_indexes
+from parsing import parse_areas, parse_prices
+from schema import AREA, HIERARCHIES, NUMERIC, SCHEMAS, SEARCH_FIELDS, TEXT, resolve_schema
+
+logger = logging.getLogger(__name__)
+
+# Text columns with at most this many distinct values per row become categoricals
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+
+# Frame column holding each listing's stable ID
+LISTING_ID = "listing_id"
+
+
+class Listings:
+    """Typed listings of one snapshot of a category sheet, built once and shared read-only.
+
+    ``frame`` keeps every sheet column under its header name, for the cards and
+    details, and adds one column per schema field under the field's name:
+    numeric fields as numbers, text and note fields as the sheet has them.
+    Fields missing from the sheet are all-empty columns, so pages never need to
+    check. The LISTING_ID column identifies a listing across snapshots and
+    column views.
+    ``rejects`` flags, per numeric field, the filled-in cells that could not be
+    parsed; they are NaN in ``frame`` and drop out of range filters. Repetitive
+    text columns are categoricals and numbers use the smallest lossless dtype;
+    ``memory`` has the frame's size in bytes before and after that compaction.
+    ``bitmaps`` holds a BitmapIndex per categorical TEXT field of at most
+    BITMAP_MAX_VALUES values and ``sorted_indexes`` a SortedIndex per numeric
+    field, for the filter engine.
+    ``hierarchy`` is the HierarchyIndex of the sheet's dependent dropdowns and
+    ``text_index`` the TextIndex of its search box, each None if it has none.
+    """
+
+    def __init__(self, sheet_name, version, frame, positions, rejects, memory, bitmaps, sorted_indexes,
+                 hierarchy, text_index):
+        self.sheet_name = sheet_name
+        self.version = version
+        self.frame = frame
+        # field name -> column position in the sheet, for the fields that were found
+        self.positions = positions
+        self.rejects = rejects
+        self.memory = memory
+        self.bitmaps = bitmaps
+        self.sorted_indexes = sorted_indexes
+        self.hierarchy = hierarchy
+        self.text_index = text_index
+        self._ids = pd.Index(frame[LISTING_ID]) if LISTING_ID in frame else pd.Index([])
+
+    def find(self, listing_id):
+        # Row position of a listing, or None when this snapshot does not have it
+        try:
+            return self._ids.get_loc(listing_id)
+        except KeyError:
+            return None
+
+
+def build_listings(sheet_name, frame, version):
+    # frame: the sheet as parsed by sheet_to_frame; version: the snapshot's fetched_at
+    resolved = resolve_schema(sheet_name, list(frame.columns))
+    fields = {}
+    rejects = {}
+    for field in SCHEMAS.get(sheet_name, []):
+        if field.name not in resolved:
+            dtype = float if field.kind in NUMERIC else object
+            fields[field.name] = pd.Series(None, index=frame.index, dtype=dtype)
+            continue
+        column = frame.iloc[:, resolved[field.name][1]]
+        if field.kind not in NUMERIC:
+            fields[field.name] = column
+            continue
+        if field.kind == AREA:
+            fields[field.name], rejects[field.name] = parse_areas(column, field.unit)
+        else:
+            fields[field.name], rejects[field.name] = parse_prices(column)
+        if rejects[field.name].any():
+            logger.info("%s: %d %s values could not be parsed", sheet_name,
+                        rejects[field.name].sum(), field.name)
+    fields = pd.DataFrame(fields, index=frame.index)
+    fields[LISTING_ID] = listing_ids(fields)
+    typed = pd.concat([frame, fields], axis=1)
+    compact = compact_frame(typed)
+    schema = SCHEMAS.get(sheet_name, [])
+    # Only fields filtered by value are indexed; NOTE fields are only ever searched
+    bitmaps = build_bitmap_indexes(compact, [field.name for field in schema if field.kind == TEXT])
+    sorted_indexes = build_sorted_indexes(compact, [field.name for field in schema if field.kind in NUMERIC])
+    hierarchy = HierarchyIndex(compact, HIERARCHIES[sheet_name]) if sheet_name in HIERARCHIES else None
+    text_index = TextIndex(compact, SEARCH_FIELDS[sheet_name]) if sheet_name in SEARCH_FIELDS else None
+    indexes = [*bitmaps.values(), *sorted_indexes.values(), *filter(None, [text_index])]
+    memory = {
+        "raw_bytes": int(typed.memory_usage(deep=True).sum()),
+        "compact_bytes": int(compact.memory_usage(deep=True).sum()),
+        "index_bytes": sum(index.nbytes for index in indexes),
+    }
+    logger.info("%s: listings take %d bytes, %d before compaction, plus %d of indexes", sheet_name,
+                memory["compact_bytes"], memory["raw_bytes"], memory["index_bytes"])
+    positions = {name: position for name, (_, position) in resolved.items()}
+    rejects = pd.DataFrame(rejects, index=frame.index)
+    return Listings(sheet_name, version, compact, positions, rejects, memory, bitmaps, sorted_indexes,
+                    hierarchy, text_index)
+
+
+def listing_ids(fields):
+    # A hash of the row's schema fields, which every column view reads, plus how
+    # many identical rows come before it: the same listing gets the same ID in
+    # every snapshot until one of those fields is edited
+    hashes = pd.util.hash_pandas_object(fields, index=False)
+    repeats = hashes.groupby(hashes).cumcount()
+    return pd.util.hash_pandas_object(pd.DataFrame({"row": hashes, "repeat": repeats}), index=False)
+
+
+def compact_frame(frame):
+    # Columns are replaced by position, since sheet headers may repeat a name
+    compact = frame.copy(deep=False)
+    for i in range(frame.shape[1]):
+        column = frame.iloc[:, i]
+        if column.dtype == object:
+            if column.nunique() <= len(column) * CATEGORY_MAX_UNIQUE_RATIO:
+                compact.isetitem(i, column.astype("category"))
+        elif column.dtype.kind == "f":
+            # float32 only when every value survives the round trip (prices can exceed 2**24)
+            narrow = column.astype("float32")
+            if ((narrow == column) | column.isna()).all():
+                compact.isetitem(i, narrow)
+        elif column.dtype.kind in "iu":
+            compact.isetitem(i, pd.to_numeric(column, downcast="integer"))
+    return compact
@@ -1,6 +1,66 @@
 import streamlit as st
-from utils import get_google_sheet_data
-import pandas as pd
+from filter_engine import filter_spec
+from listing_ui import (
+    Facets, filter_panel, html_template, search_input, show_results, sort_selectbox,
+)
+from utils import get_listings
+
+
+# One result card; rendered with render_cards, which passes row and price_field
+CARD_TEMPLATE = html_template("""
+<div class="property-card">
+    <div class="property-header">
+        <div class="property-title">{{ row["LOCATION"] }} - {{ row["BLOCK"] }}</div>
+        <div class="property-price">{{ row[price_field] | rupees }}</div>
+    </div>
+    <div class="property-details">
+        <div class="detail-item">
+            <span>📏</span>
+            <span>{{ row["size"] }} sq.ft.</span>
+        </div>
+        <div class="detail-item">
+            <span>🏠</span>
+            <span>{{ row["Kothi type"] }}</span>
+        </div>
+        <div class="detail-item">
+            <span>🧭</span>
+            <span>{{ row["FACING"] }}</span>
+        </div>
+        <div class="detail-item">
+            <span>{{ row["AVAILABLE / UNAVAILABLE"] }}</span>
+        </div>
+    </div>
+</div>
+""")
+
+# A listing's details, rendered only for the one the agent picks
+DETAIL_TEMPLATE = html_template("""
+<div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(240px, 1fr)); gap: 8px;">
+    <div class="detail-section">
+        <p><strong>Entry Date:</strong> {{ row["DATE"] }}</p>
+        <p><strong>Location:</strong> {{ row["LOCATION"] }}</p>
+        <p><strong>Block:</strong> {{ row["BLOCK"] }}</p>
+        <p><strong>House number:</strong> {{ row["NO."] }}</p>
+        <p><strong>Size:</strong> {{ row["size"] }} sq.ft.</p>
+        <p><strong>floors:</strong> {{ row["FLOORS"] }}</p>
+        <p><strong>Accomodation:</strong> {{ row["Accom."] }}</p>
+        <p><strong>Old/New:</strong> {{ row["OLD / NEW"] }}</p>
+        <p><strong>Lift:</strong> {{ row["LIFT"] }}</p>
+        <p><strong>Stilt:</strong> {{ row["STILT"] }}</p>
+    </div>
+    <div class="detail-section">
+        <p><strong>Pool:</strong> {{ row["POOL"] }}</p>
+        <p><strong>Power Backup:</strong> {{ row["PB"] }}</p>
+        <p><strong>HomeTheatre:</strong> {{ row["HOME THEATER"] }}</p>
+        <p><strong>Kothi Type:</strong> {{ row["Kothi type"] }}</p>
+        <p><strong>Facing:</strong> {{ row["FACING"] }}</p>
+        <p><strong>Offered By:</strong> {{ row["OFFERED BY"] }}</p>
+        <p><strong>Profile:</strong> {{ row["PROFILE"] }}</p>
+        <p><strong>Reference:</strong> {{ row["reference"] }}</p>
+        <p><strong>AVAILABLE / UNAVAILABLE:</strong> {{ row["AVAILABLE / UNAVAILABLE"] }}</p>
+    </div>
+</div>
+""")
 
 
 def apply_premium_ui_styles():
@@ -230,194 +290,123 @@ def apply_premium_ui_styles():
 def display_kothi_data():
     # Apply premium styling
     apply_premium_ui_styles()
+    kothi_search()
 
+
+@st.fragment
+def kothi_search():
+    # Filters and results: a widget change reruns this fragment, not the page around it
     # Fetch data
-    data = get_google_sheet_data("Kothi")
-    if data:
-        df = pd.DataFrame(data[1:], columns=data[0])
+    listings = get_listings("Kothi", view="card")
+    df = listings.frame
+    if not df.empty:
 
         st.markdown('<div class="filter-panel">', unsafe_allow_html=True)
 
-        # Property type filter
-        filter_option = st.radio(
-            "KOTHI OPTIONS",
-            ("Kothis for Sale", "Kothis for Rent"),
-            horizontal=True,
-            label_visibility="collapsed"
+        with filter_panel("kothi"):
+            query = search_input()
+
+            # Property type filter
+            filter_option = st.radio(
+                "KOTHI OPTIONS",
+                ("Kothis for Sale", "Kothis for Rent"),
+                horizontal=True,
+                label_visibility="collapsed"
+            )
+
+            # Size and Price Filters
+            col1, col2 = st.columns(2)
+            with col1:
+                min_size = int(df['size'].min())
+                max_size = int(df['size'].max())
+
+                size_col1, size_col2 = st.columns(2)
+                with size_col1:
+                    min_size_input = st.number_input("Min Size (sq. ft.)",
+                                                     min_value=min_size,
+                                                     max_value=max_size,
+                                                     value=min_size)
+                with size_col2:
+                    max_size_input = st.number_input("Max Size (sq. ft.)",
+                                                     min_value=min_size,
+                                                     max_value=max_size,
+                                                     value=max_size)
+
+            with col2:
+                price_col1, price_col2 = st.columns(2)
+                if filter_option == "Kothis for Rent":
+                    min_price = int(df['rent'].min())
+                    max_price = int(df['rent'].max())
+                    with price_col1:
+                        min_price_input = st.number_input("Min Rent (₹)",
+                                                          min_value=min_price,
+                                                          max_value=max_price,
+                                                          value=min_price)
+                    with price_col2:
+                        max_price_input = st.number_input("Max Rent (₹)",
+                                                          min_value=min_price,
+                                                          max_value=max_price,
+                                                          value=max_price)
+                else:
+                    min_sale_price = int(df['sale_price'].min())
+                    max_sale_price = int(df['sale_price'].max())
+                    with price_col1:
+                        min_price_input = st.number_input("Min Sale Price (₹)",
+                                                          min_value=min_sale_price,
+                                                          max_value=max_sale_price,
+                                                          value=min_sale_price)
+                    with price_col2:
+                        max_price_input = st.number_input("Max Sale Price (₹)",
+                                                          min_value=min_sale_price,
+                                                          max_value=max_sale_price,
+                                                          value=max_sale_price)
+
+            # Dropdowns show how many listings each option leaves, given the other filters
+            deal_type = "SALE" if filter_option == "Kothis for Sale" else "RENT"
+            price_field = "rent" if filter_option == "Kothis for Rent" else "sale_price"
+            ranges = {
+                "size": (min_size_input, max_size_input),
+                price_field: (min_price_input, max_price_input),
+            }
+            facets = Facets(
+                listings, "kothi",
+                ["location", "block", "profile", "reference"],
+                equals={"deal_type": deal_type}, ranges=ranges, text=query,
+            )
+
+            # Additional Filters arranged in the same layout as office.py
+            col3, col4 = st.columns(2)
+            with col3:
+                selected_location = facets.selectbox("Location", "location")
+            with col4:
+                selected_block = facets.selectbox("Block", "block")
+
+            col5, col6 = st.columns(2)
+            with col5:
+                selected_profile = facets.selectbox("Profile", "profile")
+            with col6:
+                selected_reference = facets.selectbox("Reference", "reference")
+
+            st.markdown('</div>', unsafe_allow_html=True)
+
+            # Filtering Logic: every filter goes into one spec, evaluated in a single pass
+            sort = sort_selectbox(price_field)
+        spec = filter_spec(
+            equals={
+                "deal_type": deal_type,
+                "location": selected_location,
+                "block": selected_block,
+                "profile": selected_profile,
+                "reference": selected_reference,
+            },
+            ranges=ranges,
+            sort=sort,
+            text=query,
         )
 
-        # Size and Price Filters
-        col1, col2 = st.columns(2)
-        with col1:
-            df['SIZE'] = pd.to_numeric(df.iloc[:, 5], errors='coerce')
-            min_size = int(df['SIZE'].min())
-            max_size = int(df['SIZE'].max())
-
-            size_col1, size_col2 = st.columns(2)
-            with size_col1:
-                min_size_input = st.number_input("Min Size (sq. ft.)",
-                                                 min_value=min_size,
-                                                 max_value=max_size,
-                                                 value=min_size)
-            with size_col2:
-                max_size_input = st.number_input("Max Size (sq. ft.)",
-                                                 min_value=min_size,
-                                                 max_value=max_size,
-                                                 value=max_size)
-
-        with col2:
-            price_col1, price_col2 = st.columns(2)
-            if filter_option == "Kothis for Rent":
-                df['PRICE'] = pd.to_numeric(df.iloc[:, 19], errors='coerce')
-                min_price = int(df['PRICE'].min())
-                max_price = int(df['PRICE'].max())
-                with price_col1:
-                    min_price_input = st.number_input("Min Rent (₹)",
-                                                      min_value=min_price,
-                                                      max_value=max_price,
-                                                      value=min_price)
-                with price_col2:
-                    max_price_input = st.number_input("Max Rent (₹)",
-                                                      min_value=min_price,
-                                                      max_value=max_price,
-                                                      value=max_price)
-            else:
-                df['SALE_PRICE'] = pd.to_numeric(df.iloc[:, 21], errors='coerce')
-                min_sale_price = int(df['SALE_PRICE'].min())
-                max_sale_price = int(df['SALE_PRICE'].max())
-                with price_col1:
-                    min_price_input = st.number_input("Min Sale Price (₹)",
-                                                      min_value=min_sale_price,
-                                                      max_value=max_sale_price,
-                                                      value=min_sale_price)
-                with price_col2:
-                    max_price_input = st.number_input("Max Sale Price (₹)",
-                                                      min_value=min_sale_price,
-                                                      max_value=max_sale_price,
-                                                      value=max_sale_price)
-
-        # Additional Filters arranged in the same layout as office.py
-        col3, col4 = st.columns(2)
-        with col3:
-            location_options = ["All"] + list(df.iloc[:, 2].dropna().unique())
-            selected_location = st.selectbox("Location", location_options)
-        with col4:
-            block_options = ["All"] + list(df.iloc[:, 3].dropna().unique())
-            selected_block = st.selectbox("Block", block_options)
-
-        col5, col6 = st.columns(2)
-        with col5:
-            profile_options = ["All"] + list(df.iloc[:, 24].dropna().unique())
-            selected_profile = st.selectbox("Profile", profile_options)
-        with col6:
-            reference_options = ["All"] + list(df.iloc[:, 25].dropna().unique())
-            selected_reference = st.selectbox("Reference", reference_options)
-
-        st.markdown('</div>', unsafe_allow_html=True)
-
-        # Filtering Logic
-        if filter_option == "Kothis for Sale":
-            filtered_data = df[df.iloc[:, 11] == "SALE"]
-        else:
-            filtered_data = df[df.iloc[:, 11] == "RENT"]
-
-        # Apply Additional Filters
-        if selected_location != "All":
-            filtered_data = filtered_data[filtered_data.iloc[:, 2] == selected_location]
-        if selected_block != "All":
-            filtered_data = filtered_data[filtered_data.iloc[:, 3] == selected_block]
-        if selected_profile != "All":
-            filtered_data = filtered_data[filtered_data.iloc[:, 24] == selected_profile]
-        if selected_reference != "All":
-            filtered_data = filtered_data[filtered_data.iloc[:, 25] == selected_reference]
-
-        # Size and Price Filtering
-        filtered_data = filtered_data[
-            (filtered_data['SIZE'] >= min_size_input) &
-            (filtered_data['SIZE'] <= max_size_input)
-        ]
-
-        if filter_option == "Kothis for Rent":
-            filtered_data = filtered_data[
-                (filtered_data['PRICE'] >= min_price_input) &
-                (filtered_data['PRICE'] <= max_price_input)
-            ]
-        else:
-            filtered_data = filtered_data[
-                (filtered_data['SALE_PRICE'] >= min_price_input) &
-                (filtered_data['SALE_PRICE'] <= max_price_input)
-            ]
-
-        # Results Counter
-        st.markdown(f"""
-            <div class="results-counter">
-                {len(filtered_data)} Premium Properties Found
-            </div>
-        """, unsafe_allow_html=True)
-
-        # Display Property Cards
-        for _, row in filtered_data.iterrows():
-            price_display = row['PRICE'] if filter_option == "Kothis for Rent" else row['SALE_PRICE']
-
-            st.markdown(f"""
-            <div class="property-card">
-                <div class="property-header">
-                    <div class="property-title">{row['LOCATION']} - {row['BLOCK']}</div>
-                    <div class="property-price">₹{price_display:,.2f}</div>
-                </div>
-                <div class="property-details">
-                    <div class="detail-item">
-                        <span>📏</span>
-                        <span>{row['SIZE']} sq.ft.</span>
-                    </div>
-                    <div class="detail-item">
-                        <span>🏠</span>
-                        <span>{row['Kothi type']}</span>
-                    </div>
-                    <div class="detail-item">
-                        <span>🧭</span>
-                        <span>{row['FACING']}</span>
-                    </div>
-                    <div class="detail-item">
-                        <span>{row["AVAILABLE / UNAVAILABLE"]}</span>
-                    </div>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-
-            # Expandable Details
-            with st.expander("View Complete Details"):
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.markdown(f"""
-                        <div class="detail-section">
-                            <p><strong>Entry Date:</strong> {row['DATE']}</p>
-                            <p><strong>Location:</strong> {row['LOCATION']}</p>
-                            <p><strong>Block:</strong> {row['BLOCK']}</p>
-                            <p><strong>House number:</strong> {row['NO.']}</p>
-                            <p><strong>Size:</strong> {row['SIZE']} sq.ft.</p>
-                            <p><strong>floors:</strong> {row['FLOORS']}</p>
-                            <p><strong>Accomodation:</strong> {row['Accom.']}</p>
-                            <p><strong>Old/New:</strong> {row['OLD / NEW']}</p>
-                            <p><strong>Lift:</strong> {row['LIFT']}</p>
-                            <p><strong>Stilt:</strong> {row['STILT']}</p>
-                        </div>
-                    """, unsafe_allow_html=True)
-                with col2:
-                    st.markdown(f"""
-                        <div class="detail-section">
-                            <p><strong>Pool:</strong> {row['POOL']}</p>
-                            <p><strong>Power Backup:</strong> {row['PB']}</p>
-                            <p><strong>HomeTheatre:</strong> {row['HOME THEATER']}</p> 
-                            <p><strong>Kothi Type:</strong> {row['Kothi type']}</p>
-                            <p><strong>Facing:</strong> {row['FACING']}</p>
-                            <p><strong>Offered By:</strong> {row['OFFERED BY']}</p>
-                            <p><strong>Profile:</strong> {row['PROFILE']}</p>
-                            <p><strong>Reference:</strong> {row.iloc[25]}</p>
-                            <p><strong>AVAILABLE / UNAVAILABLE:</strong> {row['AVAILABLE / UNAVAILABLE']}</p>
-                        </div>
-                    """, unsafe_allow_html=True)
-
+        # Results: counter, page controls, detail pane and cards, in a fragment of their own
+        show_results("Kothi", spec, "Premium Properties Found", CARD_TEMPLATE, DETAIL_TEMPLATE,
+                     ("LOCATION", "BLOCK"), price_field=price_field)
 
     else:
         st.error("Unable to load kothi data. Please try again later.")
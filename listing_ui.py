@@ -0,0 +1,231 @@
+# listing_ui.py
+from contextlib import contextmanager
+
+import pandas as pd
+import streamlit as st
+from jinja2 import Environment
+from markupsafe import Markup
+
+from config import FILTER_FORM_MODE, LISTINGS_PAGE_SIZE
+from filter_engine import ALL, cached_rows, facet_counts, filter_spec
+from ingest import LISTING_ID
+from utils import get_detail_listings, get_listings
+
+
+def _cell(value):
+    # Empty cells render blank, and line breaks inside a cell as <br>, so that a
+    # cell can never end the HTML block a page of cards is sent as
+    if pd.api.types.is_scalar(value) and pd.isna(value):
+        return ""
+    return Markup("<br>").join(str(value).splitlines())
+
+
+def _rupees(value):
+    return "" if pd.isna(value) else f"₹{value:,.2f}"
+
+
+# Autoescaping, so sheet text is never taken for markup
+_templates = Environment(autoescape=True, finalize=_cell)
+_templates.filters["rupees"] = _rupees
+
+
+# "Sort by" choices -> (figure, descending); None keeps the sheet's order
+SORT_CHOICES = {
+    "Sheet Order": None,
+    "Price: Low to High": ("price", False),
+    "Price: High to Low": ("price", True),
+    "Size: Small to Large": ("size", False),
+    "Size: Large to Small": ("size", True),
+}
+
+
+def sort_selectbox(price_field, size_field="size"):
+    # The filter spec's sort for the chosen order; pages without sizes pass size_field=None
+    choices = [choice for choice, order in SORT_CHOICES.items()
+               if order is None or order[0] == "price" or size_field]
+    order = SORT_CHOICES[st.selectbox("Sort by", choices)]
+    if order is None:
+        return None
+    figure, descending = order
+    return (price_field if figure == "price" else size_field, descending)
+
+
+# Session state key of the sidebar's form mode toggle
+FORM_MODE_KEY = "filter_form_mode"
+
+
+def form_mode_toggle():
+    st.sidebar.toggle("Apply filters together", value=FILTER_FORM_MODE, key=FORM_MODE_KEY,
+                      help="Change several filters, then apply them with one tap. "
+                           "Saves reruns on slow connections.")
+
+
+@contextmanager
+def filter_panel(page):
+    # In form mode the filters are a form: changes stay in the browser until
+    # "Apply Filters" sends them all in one rerun. Otherwise every change applies at once
+    if not st.session_state.get(FORM_MODE_KEY, FILTER_FORM_MODE):
+        yield
+        return
+    with st.form(f"{page}_filters", border=False):
+        yield
+        st.form_submit_button("Apply Filters", type="primary", use_container_width=True)
+
+
+def search_input():
+    # Free-text search over the sheet's descriptions, names and places (see schema.SEARCH_FIELDS)
+    return st.text_input("Search", placeholder="e.g. corner, park facing, society name")
+
+
+class Facets:
+    """The dropdown filters of a category page, each option shown with its count.
+
+    An option's count is the number of listings it would leave with every
+    other filter as currently set, so options that lead nowhere show (0).
+    Dropdowns in the sheet's hierarchy (location -> block, say) list only the
+    values under the choices above them. Every dropdown's counts depend on all
+    the others, so the choices are read from session state before any of them
+    is drawn.
+    """
+
+    def __init__(self, listings, page, fields, equals=None, ranges=None, text=""):
+        # equals/ranges/text: the page's other filters, as passed to filter_spec
+        self._page = page
+        self.options = {}
+        self.selected = {}
+        for field in fields:
+            self.options[field] = [ALL, *self._values(listings, field)]
+            self.selected[field] = self._current(field)
+        spec = filter_spec({**(equals or {}), **self.selected}, ranges, text=text)
+        self.counts = facet_counts(listings, spec, fields)
+
+    def _values(self, listings, field):
+        # Fields of the sheet's hierarchy list only the values under the choices
+        # made above them; ``fields`` must name the outer ones first
+        hierarchy = listings.hierarchy
+        if hierarchy is None or field not in hierarchy.levels:
+            return listings.frame[field].dropna().unique()
+        chosen = {name: value for name, value in self.selected.items() if value != ALL}
+        return hierarchy.options(field, chosen)
+
+    def _key(self, field):
+        return f"{self._page}_{field}"
+
+    def _current(self, field):
+        # A choice the current snapshot no longer has falls back to ALL
+        value = st.session_state.get(self._key(field), ALL)
+        return value if value in self.options[field] else ALL
+
+    def selectbox(self, label, field):
+        # The option labels change with the counts, and with them the widget's
+        # identity, so the choice is carried over through session state
+        key = self._key(field)
+        counts = self.counts[field]
+        st.session_state[key] = self.selected[field]
+        return st.selectbox(label, self.options[field], key=key,
+                            format_func=lambda value: f"{value} ({counts.get(value, 0)})")
+
+
+def _turn_page(key, step):
+    st.session_state[key] += step
+
+
+def results_page(listings, rows, spec, page):
+    """The current page of a search's results (``rows``, from cached_rows) as a frame.
+
+    Only these LISTINGS_PAGE_SIZE rows are taken from the listings, so a page
+    never builds or sends more cards than that. Previous/next controls are drawn
+    when there is more than one page. The page number is kept in session state
+    and goes back to the first page whenever the search changes.
+    """
+    key = f"{page}_results_page"
+    if st.session_state.get(f"{key}_spec") != spec:
+        st.session_state[key] = 0
+        st.session_state[f"{key}_spec"] = spec
+    pages = max(1, -(-len(rows) // LISTINGS_PAGE_SIZE))
+    number = st.session_state[key] = min(st.session_state[key], pages - 1)
+    start = number * LISTINGS_PAGE_SIZE
+    stop = min(start + LISTINGS_PAGE_SIZE, len(rows))
+    if pages > 1:
+        previous, position, following = st.columns([1, 2, 1])
+        previous.button("‹ Previous", key=f"{key}_previous", disabled=number == 0,
+                        on_click=_turn_page, args=(key, -1), use_container_width=True)
+        position.caption(f"Showing {start + 1}–{stop} of {len(rows)} · page {number + 1} of {pages}")
+        following.button("Next ›", key=f"{key}_next", disabled=number == pages - 1,
+                         on_click=_turn_page, args=(key, 1), use_container_width=True)
+    return listings.frame.take(rows[start:stop])
+
+
+def html_template(source):
+    # Compile a card or detail template; lines are unindented and blank ones
+    # dropped, since markdown would take indented HTML for a code block
+    return _templates.from_string("\n".join(line.strip() for line in source.splitlines() if line.strip()))
+
+
+def _records(frame):
+    # Rows as dicts keyed by column name; the first of repeated sheet headers wins
+    return frame.loc[:, ~frame.columns.duplicated()].to_dict("records")
+
+
+def render_cards(card, frame, **context):
+    """Render a page of result cards as a single markdown element.
+
+    ``card`` is an html_template template rendered once per row of ``frame``,
+    with the row as ``row``, a dict keyed by column name, and ``context`` as
+    further variables.
+    """
+    html = [card.render(row=row, **context) for row in _records(frame)]
+    st.markdown("\n".join(html), unsafe_allow_html=True)
+
+
+def detail_pane(sheet_name, frame, details, title, **context):
+    """Let the agent pick one of the listings in ``frame`` and show its details.
+
+    Nothing is rendered for the other listings. The picked listing is found by
+    its stable ID in the sheet's detail listings. Their detail-only columns are
+    read in the background on first demand, and a notice is shown until they
+    arrive. ``details`` is an html_template template, rendered like a card;
+    ``title`` names the columns an option is labelled with.
+    """
+    labels = {
+        row[LISTING_ID]: f"{number}. " + " - ".join(str(row.get(column, "")) for column in title)
+        for number, row in enumerate(_records(frame), start=1)
+    }
+    listing_id = st.selectbox(
+        "View details of", [None, *labels], key=f"{sheet_name.lower()}_detail",
+        format_func=lambda value: "Select a listing" if value is None else labels[value],
+    )
+    if listing_id is None:
+        return
+    listings = get_detail_listings(sheet_name)
+    if listings is None:
+        st.info("Loading this listing's details. Check again in a moment.")
+        st.button("Check again", key=f"{sheet_name.lower()}_detail_check")
+        return
+    position = listings.find(listing_id)
+    if position is None:
+        st.info("This listing is no longer in the sheet.")
+        return
+    row = _records(listings.frame.iloc[[position]])[0]
+    st.markdown(details.render(row=row, **context), unsafe_allow_html=True)
+
+
+@st.fragment
+def show_results(sheet_name, spec, found, card, details, title, **context):
+    """The results region of a category page: counter, page controls, detail pane and cards.
+
+    A fragment nested in the page's search fragment: turning a page or picking
+    a listing reruns only this region, while a filter change reruns the search
+    and this with it. ``found`` ends the counter ("Premium Plots Found");
+    ``card``, ``details`` and ``title`` go to render_cards and detail_pane.
+    """
+    listings = get_listings(sheet_name, view="card")
+    matches = cached_rows(listings, spec)
+    st.markdown(f"""
+        <div class="results-counter">
+            {len(matches)} {found}
+        </div>
+    """, unsafe_allow_html=True)
+    page = results_page(listings, matches, spec, sheet_name.lower())
+    detail_pane(sheet_name, page, details, title)
+    render_cards(card, page, **context)
@@ -1,3 +1,5 @@
+import logging
+
 import streamlit as st
 from kothi import display_kothi_data
 from apartment import display_apartment_data
@@ -7,6 +9,11 @@ from rented import display_rented_data
 from retail import display_retail_data
 from office import display_office_data
 from sheet_viewer import display_sheet_viewer
+from config import SHEET_REFRESHER
+from listing_ui import form_mode_toggle
+from utils import get_all_sheets_data, start_sheet_refresher
+
+logger = logging.getLogger(__name__)
 
 
 def apply_professional_ui_styles():
@@ -228,6 +235,20 @@ h2 {
     """, unsafe_allow_html=True)
 
 
+@st.cache_resource(show_spinner=False)
+def warm_up_sheet_cache():
+    # Runs once per server process: starts the background refresher, then
+    # loads every category (snapshots first, one batchGet for the rest)
+    if SHEET_REFRESHER:
+        start_sheet_refresher()
+    try:
+        get_all_sheets_data()
+    except Exception:
+        # Pages fall back to fetching their own sheet
+        logger.exception("Warming up the sheet cache failed")
+    return True
+
+
 def main():
     # Professional Page Configuration
     st.set_page_config(
@@ -240,6 +261,9 @@ def main():
     # Apply Professional UI Styles
     apply_professional_ui_styles()
 
+    # Fill the shared sheet cache for all categories up front
+    warm_up_sheet_cache()
+
     # Professional Header
     st.markdown("""
     <h1>AADHUNIK ESTATES</h1>
@@ -269,6 +293,7 @@ def main():
         menu,
         format_func=lambda x: f"{menu_config[x]} {x}"
     )
+    form_mode_toggle()
 
     # Dynamic Content Display
     display_functions = {
@@ -1,6 +1,46 @@
 import streamlit as st
-from utils import get_google_sheet_data
-import pandas as pd
+from filter_engine import filter_spec
+from listing_ui import (
+    Facets, filter_panel, html_template, search_input, show_results, sort_selectbox,
+)
+from utils import get_listings
+
+
+# One result card; rendered with render_cards, which passes row and price_field
+CARD_TEMPLATE = html_template("""
+<div class="property-card">
+    <div class="property-header">
+        <div class="property-title">{{ row["PROJECT"] }} - {{ row["LOCATION"] }}</div>
+        <div class="property-price">{{ row[price_field] | rupees }}</div>
+    </div>
+    <div class="property-details">
+        <div class="detail-item">📏 {{ row["size"] }} sq.ft.</div>
+        <div class="detail-item">🏢 {{ row["FLOOR"] }}</div>
+        <div class="detail-item">📍 {{ row["UNIT NO."] }}</div>
+        <div class="detail-item"> {{ row["AVAILABLE / UNAVAILABLE"] }}</div>
+    </div>
+</div>
+""")
+
+# A listing's details, rendered only for the one the agent picks
+DETAIL_TEMPLATE = html_template("""
+<div class="detail-section">
+    <p><strong>Date:</strong> {{ row["DATE"] }}</p>
+    <p><strong>Project:</strong> {{ row["PROJECT"] }}</p>
+    <p><strong>Location:</strong> {{ row["LOCATION"] }}</p>
+    <p><strong>Size:</strong> {{ row["size"] }} sq.ft.</p>
+    <p><strong>Floor:</strong> {{ row["FLOOR"] }}</p>
+    <p><strong>Unit:</strong> {{ row["UNIT NO."] }}</p>
+    <p><strong>Tower:</strong> {{ row["TOWER/BLOCK"] }}</p>
+    <p><strong>Status:</strong> {{ row["FURNISHED / WARMSHELL / BTS"] }}</p>
+    <p><strong>Maintenance:</strong> {{ row["MAINTENANCE"] }}</p>
+    <p><strong>Offered By:</strong> {{ row["OFFERED BY"] }}</p>
+    <p><strong>Profile:</strong> {{ row["PROFILE"] }}</p>
+    <p><strong>Reference:</strong> {{ row["REF"] }}</p>
+    <p><strong>Contact:</strong> {{ row["NUMBER"] }}</p>
+    <p><strong>Availability:</strong> {{ row["AVAILABLE / UNAVAILABLE"] }}</p>
+</div>
+""")
 
 
 def apply_premium_ui_styles():
@@ -234,157 +274,111 @@ def apply_premium_ui_styles():
 def display_office_data():
     # Apply mobile-optimized styling
     apply_premium_ui_styles()
+    office_search()
 
+
+@st.fragment
+def office_search():
+    # Filters and results: a widget change reruns this fragment, not the page around it
     # Fetch data
-    data = get_google_sheet_data("Office")
-    if data:
-        df = pd.DataFrame(data[1:], columns=data[0])
+    listings = get_listings("Office", view="card")
+    df = listings.frame
+    if not df.empty:
 
         st.markdown('<div class="filter-panel">', unsafe_allow_html=True)
 
-        # Property type filter - Mobile optimized
-        filter_option = st.radio(
-            "OFFICE OPTIONS",
-            ("Offices for Sale", "Offices for Rent"),
-            horizontal=True,
-            label_visibility="collapsed"
+        with filter_panel("office"):
+            query = search_input()
+
+            # Property type filter - Mobile optimized
+            filter_option = st.radio(
+                "OFFICE OPTIONS",
+                ("Offices for Sale", "Offices for Rent"),
+                horizontal=True,
+                label_visibility="collapsed"
+            )
+
+            # Size Filter - Single column for mobile
+            min_size = int(df['size'].min())
+            max_size = int(df['size'].max())
+
+            st.markdown("##### Size Range (sq. ft.)")
+            size_col1, size_col2 = st.columns(2)
+            with size_col1:
+                min_size_input = st.number_input("Min",
+                                                 min_value=min_size,
+                                                 max_value=max_size,
+                                                 value=min_size)
+            with size_col2:
+                max_size_input = st.number_input("Max",
+                                                 min_value=min_size,
+                                                 max_value=max_size,
+                                                 value=max_size)
+
+            # Price Filter - Single column for mobile
+            st.markdown("##### Price Range (₹)")
+            if filter_option == "Offices for Rent":
+                min_price = int(df['rent'].min())
+                max_price = int(df['rent'].max())
+            else:
+                min_price = int(df['sale_price'].min())
+                max_price = int(df['sale_price'].max())
+
+            price_col1, price_col2 = st.columns(2)
+            with price_col1:
+                min_price_input = st.number_input("Min Price",
+                                                  min_value=min_price,
+                                                  max_value=max_price,
+                                                  value=min_price)
+            with price_col2:
+                max_price_input = st.number_input("Max Price",
+                                                  min_value=min_price,
+                                                  max_value=max_price,
+                                                  value=max_price)
+
+            # Dropdowns show how many listings each option leaves, given the other filters
+            deal_type = "SALE" if filter_option == "Offices for Sale" else "RENT"
+            price_field = "rent" if filter_option == "Offices for Rent" else "sale_price"
+            ranges = {
+                "size": (min_size_input, max_size_input),
+                price_field: (min_price_input, max_price_input),
+            }
+            facets = Facets(
+                listings, "office",
+                ["location", "project", "profile", "reference"],
+                equals={"deal_type": deal_type}, ranges=ranges, text=query,
+            )
+
+            # Location and Project Filters
+            selected_location = facets.selectbox("Location", "location")
+
+            selected_type = facets.selectbox("Project", "project")
+
+            # Profile and Reference Filters
+            selected_profile = facets.selectbox("Profile", "profile")
+
+            selected_reference = facets.selectbox("Reference", "reference")
+
+            st.markdown('</div>', unsafe_allow_html=True)
+
+            # Filtering Logic: every filter goes into one spec, evaluated in a single pass
+            sort = sort_selectbox(price_field)
+        spec = filter_spec(
+            equals={
+                "deal_type": deal_type,
+                "location": selected_location,
+                "project": selected_type,
+                "profile": selected_profile,
+                "reference": selected_reference,
+            },
+            ranges=ranges,
+            sort=sort,
+            text=query,
         )
 
-        # Size Filter - Single column for mobile
-        df['SIZE'] = pd.to_numeric(df.iloc[:, 4], errors='coerce')
-        min_size = int(df['SIZE'].min())
-        max_size = int(df['SIZE'].max())
-
-        st.markdown("##### Size Range (sq. ft.)")
-        size_col1, size_col2 = st.columns(2)
-        with size_col1:
-            min_size_input = st.number_input("Min",
-                                             min_value=min_size,
-                                             max_value=max_size,
-                                             value=min_size)
-        with size_col2:
-            max_size_input = st.number_input("Max",
-                                             min_value=min_size,
-                                             max_value=max_size,
-                                             value=max_size)
-
-        # Price Filter - Single column for mobile
-        st.markdown("##### Price Range (₹)")
-        if filter_option == "Offices for Rent":
-            df['PRICE'] = pd.to_numeric(df.iloc[:, 12], errors='coerce')
-            min_price = int(df['PRICE'].min())
-            max_price = int(df['PRICE'].max())
-        else:
-            df['SALE_PRICE'] = pd.to_numeric(df.iloc[:, 13], errors='coerce')
-            min_price = int(df['SALE_PRICE'].min())
-            max_price = int(df['SALE_PRICE'].max())
-
-        price_col1, price_col2 = st.columns(2)
-        with price_col1:
-            min_price_input = st.number_input("Min Price",
-                                              min_value=min_price,
-                                              max_value=max_price,
-                                              value=min_price)
-        with price_col2:
-            max_price_input = st.number_input("Max Price",
-                                              min_value=min_price,
-                                              max_value=max_price,
-                                              value=max_price)
-
-        # Location and Project Filters
-        location_options = ["All"] + list(df.iloc[:, 2].dropna().unique())
-        selected_location = st.selectbox("Location", location_options)
-
-        type_options = ["All"] + list(df.iloc[:, 3].dropna().unique())
-        selected_type = st.selectbox("Project", type_options)
-
-        # Profile and Reference Filters
-        profile_options = ["All"] + list(df.iloc[:, 21].dropna().unique())
-        selected_profile = st.selectbox("Profile", profile_options)
-
-        reference_options = ["All"] + list(df.iloc[:, 22].dropna().unique())
-        selected_reference = st.selectbox("Reference", reference_options)
-
-        st.markdown('</div>', unsafe_allow_html=True)
-
-        # Filtering Logic
-        if filter_option == "Offices for Sale":
-            filtered_data = df[df.iloc[:, 11] == "SALE"]
-        else:
-            filtered_data = df[df.iloc[:, 11] == "RENT"]
-
-        # Apply filters
-        if selected_location != "All":
-            filtered_data = filtered_data[filtered_data.iloc[:, 2] == selected_location]
-        if selected_type != "All":
-            filtered_data = filtered_data[filtered_data.iloc[:, 3] == selected_type]
-        if selected_profile != "All":
-            filtered_data = filtered_data[filtered_data.iloc[:, 21] == selected_profile]
-        if selected_reference != "All":
-            filtered_data = filtered_data[filtered_data.iloc[:, 22] == selected_reference]
-
-        filtered_data = filtered_data[
-            (filtered_data['SIZE'] >= min_size_input) &
-            (filtered_data['SIZE'] <= max_size_input)
-            ]
-
-        if filter_option == "Offices for Rent":
-            filtered_data = filtered_data[
-                (filtered_data['PRICE'] >= min_price_input) &
-                (filtered_data['PRICE'] <= max_price_input)
-                ]
-        else:
-            filtered_data = filtered_data[
-                (filtered_data['SALE_PRICE'] >= min_price_input) &
-                (filtered_data['SALE_PRICE'] <= max_price_input)
-                ]
-
-        # Results Counter
-        st.markdown(f"""
-            <div class="results-counter">
-                {len(filtered_data)} Properties Found
-            </div>
-        """, unsafe_allow_html=True)
-
-        # Display Property Cards
-        for _, row in filtered_data.iterrows():
-            price_display = row['PRICE'] if filter_option == "Offices for Rent" else row['SALE_PRICE']
-
-            st.markdown(f"""
-            <div class="property-card">
-                <div class="property-header">
-                    <div class="property-title">{row['PROJECT']} - {row['LOCATION']}</div>
-                    <div class="property-price">₹{price_display:,.2f}</div>
-                </div>
-                <div class="property-details">
-                    <div class="detail-item">📏 {row['SIZE']} sq.ft.</div>
-                    <div class="detail-item">🏢 {row['FLOOR']}</div>
-                    <div class="detail-item">📍 {row['UNIT NO.']}</div>   
-                    <div class="detail-item"> {row['AVAILABLE / UNAVAILABLE']}</div>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-
-            # Mobile-Optimized Expandable Details
-            with st.expander("View Details"):
-                st.markdown(f"""
-                    <div class="detail-section">
-                        <p><strong>Date:</strong> {row['DATE']}</p>
-                        <p><strong>Project:</strong> {row['PROJECT']}</p>
-                        <p><strong>Location:</strong> {row['LOCATION']}</p>
-                        <p><strong>Size:</strong> {row['SIZE']} sq.ft.</p>
-                        <p><strong>Floor:</strong> {row['FLOOR']}</p>
-                        <p><strong>Unit:</strong> {row['UNIT NO.']}</p>
-                        <p><strong>Tower:</strong> {row['TOWER/BLOCK']}</p>
-                        <p><strong>Status:</strong> {row['FURNISHED / WARMSHELL / BTS']}</p>
-                        <p><strong>Maintenance:</strong> {row['MAINTENANCE']}</p>
-                        <p><strong>Offered By:</strong> {row['OFFERED BY']}</p>
-                        <p><strong>Profile:</strong> {row['PROFILE']}</p>
-                        <p><strong>Reference:</strong> {row['REF']}</p>
-                        <p><strong>Contact:</strong> {row['NUMBER']}</p>
-                        <p><strong>Availability:</strong> {row['AVAILABLE / UNAVAILABLE']}</p>
-                    </div>
-                """, unsafe_allow_html=True)
+        # Results: counter, page controls, detail pane and cards, in a fragment of their own
+        show_results("Office", spec, "Properties Found", CARD_TEMPLATE, DETAIL_TEMPLATE,
+                     ("PROJECT", "LOCATION"), price_field=price_field)
 
     else:
         st.error("Unable to load office data. Please try again later.")
@@ -0,0 +1,91 @@
+# parsing.py
+import numpy as np
+import pandas as pd
+
+# Area units, in square feet per unit
+SQ_FT = "sq ft"
+SQ_YD = "sq yd"
+SQ_M = "sq m"
+ACRE = "acre"
+AREA_UNITS = {SQ_FT: 1.0, SQ_YD: 9.0, SQ_M: 10.7639, ACRE: 43560.0}
+
+# Spellings seen after an area figure, with dots and spaces removed
+_AREA_ALIASES = {
+    SQ_FT: ["sqft", "sqfeet", "sqfoot", "squarefeet", "squarefoot", "sft", "ft", "feet"],
+    SQ_YD: ["sqyd", "sqyds", "sqyard", "sqyards", "squareyard", "squareyards", "yd", "yds",
+            "yard", "yards", "gaj", "gaz"],
+    SQ_M: ["sqm", "sqmt", "sqmtr", "sqmtrs", "sqmeter", "sqmeters", "sqmetre", "sqmetres",
+           "squaremeter", "squaremeters", "squaremetre", "squaremetres", "m2"],
+    ACRE: ["acre", "acres"],
+}
+_AREA_FACTORS = {alias: AREA_UNITS[unit] for unit, aliases in _AREA_ALIASES.items() for alias in aliases}
+
+# Indian price words, in rupees per unit
+_PRICE_FACTORS = {
+    "cr": 1e7, "crs": 1e7, "crore": 1e7, "crores": 1e7,
+    "l": 1e5, "lac": 1e5, "lacs": 1e5, "lakh": 1e5, "lakhs": 1e5,
+    "k": 1e3, "thousand": 1e3,
+}
+
+_NUMBER = r"(\d+(?:\.\d+)?|\.\d+)"
+
+
+def _clean(values):
+    # Lower-cased strings with missing values as <NA>; blank marks cells that are empty on purpose
+    text = values.astype("string").str.strip().str.lower()
+    blank = text.isna() | (text == "")
+    return text, blank
+
+
+def _per_distinct(parse, values, *args):
+    # Sheets repeat the same few prices and sizes, so each distinct cell is
+    # parsed once and the results are spread back over the rows
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    parsed, rejects = parse(pd.Series(uniques, dtype=object), *args)
+    parsed = np.append(parsed.to_numpy(), np.nan)[codes]
+    rejects = np.append(rejects.to_numpy(dtype=bool), False)[codes]
+    return pd.Series(parsed, index=values.index), pd.Series(rejects, index=values.index)
+
+
+def parse_prices(values):
+    """Parse rupee amounts such as "1,25,000", "₹45000/-", "1.2 Cr" or "85 L".
+
+    Returns the amounts as float64 and a boolean mask of the non-empty cells that
+    could not be read; those parse to NaN, as do empty cells.
+    """
+    return _per_distinct(_parse_prices, values)
+
+
+def parse_areas(values, unit=SQ_FT):
+    """Parse areas such as "1,500", "250 sq yd", "250 gaj" or "1.5 acres" into ``unit``.
+
+    Figures without a unit are taken to be in ``unit`` already. Returns float64
+    values and the mask of non-empty cells that could not be read.
+    """
+    return _per_distinct(_parse_areas, values, unit)
+
+
+def _parse_prices(values):
+    text, blank = _clean(values)
+    text = (
+        text.str.replace(r"^(?:₹|rs\.?|inr)", "", regex=True)
+        .str.replace(r"(?:/-|psf|/sqft|persqft)$", "", regex=True)
+        .str.replace(r"[,\s]", "", regex=True)
+    )
+    parts = text.str.extract(f"^{_NUMBER}([a-z]+)?\\.?$")
+    amounts = pd.to_numeric(parts[0], errors="coerce").astype("float64")
+    factors = parts[1].map(_PRICE_FACTORS, na_action="ignore").astype("float64")
+    factors = factors.where(parts[1].notna(), 1.0)
+    amounts = (amounts * factors).round(2)
+    return amounts, amounts.isna() & ~blank
+
+
+def _parse_areas(values, unit):
+    text, blank = _clean(values)
+    parts = text.str.replace(r"[,\s]", "", regex=True).str.extract(f"^{_NUMBER}(.*)$")
+    amounts = pd.to_numeric(parts[0], errors="coerce").astype("float64")
+    aliases = parts[1].str.replace(".", "", regex=False)
+    factors = aliases.map(_AREA_FACTORS, na_action="ignore").astype("float64")
+    factors = factors.where(aliases.fillna("") != "", AREA_UNITS[unit])
+    areas = (amounts * factors / AREA_UNITS[unit]).round(2)
+    return areas, areas.isna() & ~blank
@@ -1,6 +1,62 @@
 import streamlit as st
-from utils import get_google_sheet_data
-import pandas as pd
+from filter_engine import filter_spec
+from listing_ui import (
+    Facets, filter_panel, html_template, search_input, show_results, sort_selectbox,
+)
+from utils import get_listings
+
+
+# One result card; rendered with render_cards, which passes row and price_field
+CARD_TEMPLATE = html_template("""
+<div class="property-card">
+    <div class="property-header">
+        <div class="property-title">{{ row["LOCATION"] }} - {{ row["BLOCK"] }}</div>
+        <div class="property-price">{{ row[price_field] | rupees }}</div>
+    </div>
+    <div class="property-details">
+        <div class="detail-item">
+            <span>📏</span>
+            <span>{{ row["size"] }} sq. yd.</span>
+        </div>
+        <div class="detail-item">
+            <span>🏗️</span>
+            <span>Plot {{ row["PLOT NO"] }}</span>
+        </div>
+        <div class="detail-item">
+            <span>🛣️</span>
+            <span>{{ row["ROAD WIDTH"] }}</span>
+        </div>
+        <div class="detail-item">
+            <span>{{ row["AVAILABLE / UNAVAILABLE"] }}</span>
+        </div>
+    </div>
+</div>
+""")
+
+# A listing's details, rendered only for the one the agent picks
+DETAIL_TEMPLATE = html_template("""
+<div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(240px, 1fr)); gap: 8px;">
+    <div class="detail-section">
+        <p><strong>Entry Date:</strong> {{ row["DATE"] }}</p>
+        <p><strong>Location:</strong> {{ row["LOCATION"] }}</p>
+        <p><strong>Block:</strong> {{ row["BLOCK"] }}</p>
+        <p><strong>Plot No:</strong> {{ row["PLOT NO"] }}</p>
+        <p><strong>Size:</strong> {{ row["size"] }} sq. yd.</p>
+    </div>
+    <div class="detail-section">
+        <p><strong>Road Width:</strong> {{ row["ROAD WIDTH"] }}</p>
+        <p><strong>Doc Charges:</strong> {{ row["DOC. CHARGES"] }}</p>
+        <p><strong>Other Charges:</strong> {{ row["OTHER CHARGES"] }}</p>
+        <p><strong>Offered By:</strong> {{ row["OFFERED BY"] }}</p>
+    </div>
+</div>
+<div class="contact-section">
+    <p><strong>Contact:</strong> {{ row["NUMBER"] }}</p>
+    <p><strong>Profile:</strong> {{ row["PROFILE"] }}</p>
+    <p><strong>Reference:</strong> {{ row["REF"] }}</p>
+    <p><strong>Description:</strong> {{ row["DESCRIPTION"] }}</p>
+</div>
+""")
 
 
 def apply_premium_ui_styles():
@@ -232,156 +288,100 @@ def apply_premium_ui_styles():
 def display_plot_data():
     # Apply premium styling
     apply_premium_ui_styles()
+    plot_search()
 
+
+@st.fragment
+def plot_search():
+    # Filters and results: a widget change reruns this fragment, not the page around it
     # Fetch data
-    data = get_google_sheet_data("Plot")
-    if data:
-        df = pd.DataFrame(data[1:], columns=data[0])
+    listings = get_listings("Plot", view="card")
+    df = listings.frame
+    if not df.empty:
 
         st.markdown('<div class="filter-panel">', unsafe_allow_html=True)
 
-        # Create dynamic columns based on indices
-        df['SIZE'] = pd.to_numeric(df.iloc[:, 5], errors='coerce')
-        df['SALE_PRICE'] = pd.to_numeric(df.iloc[:, 9], errors='coerce')
-
-        # Size and Price Filters
-        col1, col2 = st.columns(2)
-        with col1:
-            size_col1, size_col2 = st.columns(2)
-            min_size = int(df['SIZE'].min())
-            max_size = int(df['SIZE'].max())
-
-            with size_col1:
-                min_size_input = st.number_input("Min Size (sq. yd.)",
-                                                 min_value=min_size,
-                                                 max_value=max_size,
-                                                 value=min_size)
-            with size_col2:
-                max_size_input = st.number_input("Max Size (sq. yd.)",
-                                                 min_value=min_size,
-                                                 max_value=max_size,
-                                                 value=max_size)
-
-        with col2:
-            price_col1, price_col2 = st.columns(2)
-            min_sale_price = int(df['SALE_PRICE'].min())
-            max_sale_price = int(df['SALE_PRICE'].max())
-            with price_col1:
-                min_price_input = st.number_input("Min Sale Price (₹)",
-                                                  min_value=min_sale_price,
-                                                  max_value=max_sale_price,
-                                                  value=min_sale_price)
-            with price_col2:
-                max_price_input = st.number_input("Max Sale Price (₹)",
-                                                  min_value=min_sale_price,
-                                                  max_value=max_sale_price,
-                                                  value=max_sale_price)
-
-        # Additional Filters
-        col3, col4 = st.columns(2)
-        with col3:
-            location_options = ["All"] + list(df.iloc[:, 2].dropna().unique())
-            selected_location = st.selectbox("Location", location_options)
-        with col4:
-            block_options = ["All"] + list(df.iloc[:, 3].dropna().unique())
-            selected_block = st.selectbox("Block", block_options)
-
-        col5, col6 = st.columns(2)
-        with col5:
-            profile_options = ["All"] + list(df.iloc[:, 14].dropna().unique())
-            selected_profile = st.selectbox("Profile", profile_options)
-        with col6:
-            reference_options = ["All"] + list(df.iloc[:, 15].dropna().unique())
-            selected_reference = st.selectbox("Reference", reference_options)
-
-        st.markdown('</div>', unsafe_allow_html=True)
-
-        # Filtering Logic
-        filtered_data = df.copy()
-
-        # Apply Filters
-        if selected_location != "All":
-            filtered_data = filtered_data[filtered_data.iloc[:, 2] == selected_location]
-        if selected_block != "All":
-            filtered_data = filtered_data[filtered_data.iloc[:, 3] == selected_block]
-        if selected_profile != "All":
-            filtered_data = filtered_data[filtered_data.iloc[:, 14] == selected_profile]
-        if selected_reference != "All":
-            filtered_data = filtered_data[filtered_data.iloc[:, 15] == selected_reference]
-
-        # Size and Price Filtering
-        filtered_data = filtered_data[
-            (filtered_data['SIZE'] >= min_size_input) &
-            (filtered_data['SIZE'] <= max_size_input) &
-            (filtered_data['SALE_PRICE'] >= min_price_input) &
-            (filtered_data['SALE_PRICE'] <= max_price_input)
-            ]
-
-        # Results Counter
-        st.markdown(f"""
-            <div class="results-counter">
-                {len(filtered_data)} Premium Plots Found
-            </div>
-        """, unsafe_allow_html=True)
-
-        # Display Property Cards
-        for _, row in filtered_data.iterrows():
-            st.markdown(f"""
-            <div class="property-card">
-                <div class="property-header">
-                    <div class="property-title">{row['LOCATION']} - {row['BLOCK']}</div>
-                    <div class="property-price">₹{float(row['SALE_PRICE']):,.2f}</div>
-                </div>
-                <div class="property-details">
-                    <div class="detail-item">
-                        <span>📏</span>
-                        <span>{row['SIZE']} sq. yd.</span>
-                    </div>
-                    <div class="detail-item">
-                        <span>🏗️</span>
-                        <span>Plot {row['PLOT NO']}</span>
-                    </div>    
-                    <div class="detail-item">
-                        <span>🛣️</span>
-                        <span>{row['ROAD WIDTH']}</span>
-                    </div>
-                    <div class="detail-item">
-                        <span>{row['AVAILABLE / UNAVAILABLE']}</span>
-                    </div>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-
-            # Expandable Details
-            with st.expander("View Complete Details"):
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.markdown(f"""
-                        <div class="detail-section">
-                            <p><strong>Entry Date:</strong> {row['DATE']}</p>
-                            <p><strong>Location:</strong> {row['LOCATION']}</p>
-                            <p><strong>Block:</strong> {row['BLOCK']}</p>
-                            <p><strong>Plot No:</strong> {row['PLOT NO']}</p>
-                            <p><strong>Size:</strong> {row['SIZE']} sq. yd.</p>
-                        </div>
-                    """, unsafe_allow_html=True)
-                with col2:
-                    st.markdown(f"""
-                        <div class="detail-section">
-                            <p><strong>Road Width:</strong> {row['ROAD WIDTH']}</p>
-                            <p><strong>Doc Charges:</strong> {row['DOC. CHARGES']}</p>
-                            <p><strong>Other Charges:</strong> {row['OTHER CHARGES']}</p>
-                            <p><strong>Offered By:</strong> {row['OFFERED BY']}</p>
-                        </div>
-                    """, unsafe_allow_html=True)
-                st.markdown(f"""
-                    <div class="contact-section">
-                        <p><strong>Contact:</strong> {row['NUMBER']}</p>
-                        <p><strong>Profile:</strong> {row['PROFILE']}</p>
-                        <p><strong>Reference:</strong> {row['REF']}</p>
-                        <p><strong>Description:</strong> {row['DESCRIPTION']}</p>
-                    </div>
-                """, unsafe_allow_html=True)
+        with filter_panel("plot"):
+            query = search_input()
+
+            # Create dynamic columns based on indices
+
+            # Size and Price Filters
+            col1, col2 = st.columns(2)
+            with col1:
+                size_col1, size_col2 = st.columns(2)
+                min_size = int(df['size'].min())
+                max_size = int(df['size'].max())
+
+                with size_col1:
+                    min_size_input = st.number_input("Min Size (sq. yd.)",
+                                                     min_value=min_size,
+                                                     max_value=max_size,
+                                                     value=min_size)
+                with size_col2:
+                    max_size_input = st.number_input("Max Size (sq. yd.)",
+                                                     min_value=min_size,
+                                                     max_value=max_size,
+                                                     value=max_size)
+
+            with col2:
+                price_col1, price_col2 = st.columns(2)
+                min_sale_price = int(df['sale_price'].min())
+                max_sale_price = int(df['sale_price'].max())
+                with price_col1:
+                    min_price_input = st.number_input("Min Sale Price (₹)",
+                                                      min_value=min_sale_price,
+                                                      max_value=max_sale_price,
+                                                      value=min_sale_price)
+                with price_col2:
+                    max_price_input = st.number_input("Max Sale Price (₹)",
+                                                      min_value=min_sale_price,
+                                                      max_value=max_sale_price,
+                                                      value=max_sale_price)
+
+            # Dropdowns show how many listings each option leaves, given the other filters
+            ranges = {
+                "size": (min_size_input, max_size_input),
+                "sale_price": (min_price_input, max_price_input),
+            }
+            facets = Facets(
+                listings, "plot",
+                ["location", "block", "profile", "reference"],
+                ranges=ranges, text=query,
+            )
+
+            # Additional Filters
+            col3, col4 = st.columns(2)
+            with col3:
+                selected_location = facets.selectbox("Location", "location")
+            with col4:
+                selected_block = facets.selectbox("Block", "block")
+
+            col5, col6 = st.columns(2)
+            with col5:
+                selected_profile = facets.selectbox("Profile", "profile")
+            with col6:
+                selected_reference = facets.selectbox("Reference", "reference")
+
+            st.markdown('</div>', unsafe_allow_html=True)
+
+            # Filtering Logic: every filter goes into one spec, evaluated in a single pass
+            sort = sort_selectbox("sale_price")
+        spec = filter_spec(
+            equals={
+                "location": selected_location,
+                "block": selected_block,
+                "profile": selected_profile,
+                "reference": selected_reference,
+            },
+            ranges=ranges,
+            sort=sort,
+            text=query,
+        )
+
+        # Results: counter, page controls, detail pane and cards, in a fragment of their own
+        show_results("Plot", spec, "Premium Plots Found", CARD_TEMPLATE, DETAIL_TEMPLATE,
+                     ("LOCATION", "BLOCK"), price_field="sale_price")
 
     else:
         st.error("Unable to load plot data. Please try again later.")
@@ -0,0 +1,30 @@
+# rate_limiter.py
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket: refills ``rate`` tokens a second, holds at most ``capacity``.
+
+    A caller that finds the bucket empty reserves the next token and sleeps until
+    it is due, so waiting callers are served in the order they arrived.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        # Take one token, blocking until it is available; returns the seconds waited
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
@@ -0,0 +1,100 @@
+# refresher.py
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Failed polls are retried sooner than the regular interval, but never more often than this
+RETRY_DELAY = 30.0
+
+
+class SheetRefresher:
+    """Daemon thread that polls each sheet on its own interval and publishes fresh reads.
+
+    ``fetch(sheet_names)`` returns one SheetSnapshot per name and ``publish(snapshot)``
+    swaps it in; sheets that fall due together are fetched in one call.
+    """
+
+    def __init__(self, sheet_names, intervals, default_interval, fetch, publish):
+        self._fetch = fetch
+        self._publish = publish
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._status = {
+            sheet_name: {
+                "interval": intervals.get(sheet_name, default_interval),
+                "next_due": 0.0,
+                "last_success": None,
+                "last_error": None,
+                "last_error_at": None,
+                "consecutive_failures": 0,
+            }
+            for sheet_name in sheet_names
+        }
+
+    def start(self):
+        if self.is_running():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sheet-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def polls(self, sheet_name):
+        return sheet_name in self._status
+
+    def status(self):
+        with self._lock:
+            return {sheet_name: dict(status) for sheet_name, status in self._status.items()}
+
+    def _run(self):
+        while not self._stop.is_set():
+            now = time.time()
+            with self._lock:
+                due = [name for name, status in self._status.items() if status["next_due"] <= now]
+            if due:
+                self.refresh(due)
+            with self._lock:
+                next_due = min(status["next_due"] for status in self._status.values())
+            self._stop.wait(max(next_due - time.time(), 1.0))
+
+    def refresh(self, sheet_names):
+        started = time.time()
+        try:
+            fetched = self._fetch(sheet_names)
+        except Exception as e:
+            logger.exception("Refreshing %s failed", ", ".join(sheet_names))
+            for sheet_name in sheet_names:
+                self._record_failure(sheet_name, e, started)
+            return
+
+        for sheet_name, snapshot in zip(sheet_names, fetched):
+            if not snapshot.data:
+                self._record_failure(sheet_name, "empty response", started)
+                continue
+            try:
+                self._publish(snapshot)
+            except Exception as e:
+                logger.exception("Publishing %s failed", sheet_name)
+                self._record_failure(sheet_name, e, started)
+                continue
+            with self._lock:
+                status = self._status[sheet_name]
+                status["last_success"] = time.time()
+                status["consecutive_failures"] = 0
+                status["next_due"] = started + status["interval"]
+
+    def _record_failure(self, sheet_name, error, started):
+        with self._lock:
+            status = self._status[sheet_name]
+            status["last_error"] = str(error)
+            status["last_error_at"] = time.time()
+            status["consecutive_failures"] += 1
+            status["next_due"] = started + min(status["interval"], RETRY_DELAY)
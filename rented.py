@@ -1,6 +1,59 @@
 import streamlit as st
-from utils import get_google_sheet_data
-import pandas as pd
+from filter_engine import filter_spec
+from listing_ui import (
+    Facets, filter_panel, html_template, search_input, show_results, sort_selectbox,
+)
+from utils import get_listings
+
+
+# One result card; rendered with render_cards, which passes row and price_field
+CARD_TEMPLATE = html_template("""
+<div class="property-card">
+    <div class="property-header">
+        <div class="property-title">{{ row["COMPANY NAME"] }} - {{ row["BUILDING"] }}</div>
+        <div class="property-price">{{ row[price_field] | rupees }}</div>
+    </div>
+    <div class="property-details">
+        <div class="detail-item">
+            <span>📏</span>
+            <span>{{ row["AREA (IN SQ.FT.) (A/T)"] }} sq.ft.</span>
+        </div>
+        <div class="detail-item">
+            <span>🏢</span>
+            <span>{{ row["UNIT NO."] }} | Floor {{ row["FLOOR"] }}</span>
+        </div>
+        <div class="detail-item">
+            <span>📍</span>
+            <span>{{ row["LOCATION"] }}</span>
+        </div>
+    </div>
+</div>
+""")
+
+# A listing's details, rendered only for the one the agent picks
+DETAIL_TEMPLATE = html_template("""
+<div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(240px, 1fr)); gap: 8px;">
+    <div class="detail-section">
+        <p><strong>Date:</strong> {{ row["DATE"] }}</p>
+        <p><strong>Building:</strong> {{ row["BUILDING"] }}</p>
+        <p><strong>Location:</strong> {{ row["LOCATION"] }}</p>
+        <p><strong>Company:</strong> {{ row["COMPANY NAME"] }}</p>
+        <p><strong>Commencement:</strong> {{ row["COMMENCEMENT"] }}</p>
+    </div>
+    <div class="detail-section">
+        <p><strong>Rent PSF:</strong> ₹{{ row["RENT PSF"] }}</p>
+        <p><strong>Lease Rent:</strong> ₹{{ row["LEASE RENT"] }}</p>
+        <p><strong>Security:</strong> {{ row["SECURITY"] }}</p>
+        <p><strong>Term:</strong> {{ row["TERM"] }}</p>
+    </div>
+</div>
+<div class="additional-details">
+    <p><strong>Lock-in Period:</strong> {{ row["LOCKIN"] }}</p>
+    <p><strong>Increment:</strong> {{ row["INCREMENT"] }}</p>
+    <p><strong>Return:</strong> {{ row["RETURN"] }}</p>
+    <p><strong>Offered By:</strong> {{ row["OFFERED BY"] }}</p>
+</div>
+""")
 
 
 def apply_premium_ui_styles():
@@ -253,143 +306,87 @@ def apply_premium_ui_styles():
 def display_rented_data():
     # Apply premium styling
     apply_premium_ui_styles()
+    rented_search()
 
 
+@st.fragment
+def rented_search():
+    # Filters and results: a widget change reruns this fragment, not the page around it
     # Fetch data
-    data = get_google_sheet_data("Rented")
-    if data:
-        df = pd.DataFrame(data[1:], columns=data[0])
+    listings = get_listings("Rented", view="card")
+    df = listings.frame
+    if not df.empty:
 
         st.markdown('<div class="filter-panel">', unsafe_allow_html=True)
 
-        # Price Filters
-        col1, col2 = st.columns(2)
-        with col1:
-            df['PRICE'] = pd.to_numeric(df.iloc[:, 12], errors='coerce')
-            min_price = int(df['PRICE'].min())
-            max_price = int(df['PRICE'].max())
-
-            price_col1, price_col2 = st.columns(2)
-            with price_col1:
-                min_price_input = st.number_input("Min Price (PSF) (₹)",
-                                                  min_value=min_price,
-                                                  max_value=max_price,
-                                                  value=min_price)
-            with price_col2:
-                max_price_input = st.number_input("Max Price (PSF) (₹)",
-                                                  min_value=min_price,
-                                                  max_value=max_price,
-                                                  value=max_price)
-
-        # Property Filters
-        col3, col4 = st.columns(2)
-        with col3:
-            category_options = ["All"] + list(df.iloc[:, 0].dropna().unique())
-            selected_category = st.selectbox("Category", category_options)
-            type_options = ["All"] + list(df.iloc[:, 3].dropna().unique())
-            selected_type = st.selectbox("Property Type", type_options)
-        with col4:
-            configuration_options = ["All"] + list(df.iloc[:, 6].dropna().unique())
-            selected_configuration = st.selectbox("Configuration", configuration_options)
-            facing_options = ["All"] + list(df.iloc[:, 7].dropna().unique())
-            selected_facing = st.selectbox("Facing", facing_options)
-
-        # Location and Reference Filters
-        col5, col6 = st.columns(2)
-        with col5:
-            location_options = ["All"] + list(df.iloc[:, 2].dropna().unique())
-            selected_location = st.selectbox("Location", location_options)
-        with col6:
-            ref_options = ["All"] + list(df.iloc[:, 14].dropna().unique())
-            selected_ref = st.selectbox("Reference", ref_options)
-
-        st.markdown('</div>', unsafe_allow_html=True)
-
-        # Filtering Logic
-        filtered_data = df.copy()
-
-        # Apply Filters
-        if selected_category != "All":
-            filtered_data = filtered_data[filtered_data.iloc[:, 0] == selected_category]
-        if selected_location != "All":
-            filtered_data = filtered_data[filtered_data.iloc[:, 2] == selected_location]
-        if selected_type != "All":
-            filtered_data = filtered_data[filtered_data.iloc[:, 3] == selected_type]
-        if selected_configuration != "All":
-            filtered_data = filtered_data[filtered_data.iloc[:, 6] == selected_configuration]
-        if selected_facing != "All":
-            filtered_data = filtered_data[filtered_data.iloc[:, 7] == selected_facing]
-        if selected_ref != "All":
-            filtered_data = filtered_data[filtered_data.iloc[:, 14] == selected_ref]
-
-        # Price Filtering
-        filtered_data = filtered_data[
-            (filtered_data['PRICE'] >= min_price_input) &
-            (filtered_data['PRICE'] <= max_price_input)
-            ]
-
-        # Results Counter
-        st.markdown(f"""
-            <div class="results-counter">
-                {len(filtered_data)} Premium Properties Found
-            </div>
-        """, unsafe_allow_html=True)
-
-        # Display Property Cards
-        for _, row in filtered_data.iterrows():
-            st.markdown(f"""
-            <div class="property-card">
-                <div class="property-header">
-                    <div class="property-title">{row['COMPANY NAME']} - {row['BUILDING']}</div>
-                    <div class="property-price">₹{row['PRICE']:,.2f}</div>
-                </div>
-                <div class="property-details">
-                    <div class="detail-item">
-                        <span>📏</span>
-                        <span>{row['AREA (IN SQ.FT.) (A/T)']} sq.ft.</span>
-                    </div>
-                    <div class="detail-item">
-                        <span>🏢</span>
-                        <span>{row['UNIT NO.']} | Floor {row['FLOOR']}</span>
-                    </div>
-                    <div class="detail-item">
-                        <span>📍</span>
-                        <span>{row['LOCATION']}</span>
-                    </div>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-
-            # Expandable Details
-            with st.expander("View Complete Details"):
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.markdown(f"""
-                        <div class="detail-section">
-                            <p><strong>Date:</strong> {row['DATE']}</p>
-                            <p><strong>Building:</strong> {row['BUILDING']}</p>
-                            <p><strong>Location:</strong> {row['LOCATION']}</p>
-                            <p><strong>Company:</strong> {row['COMPANY NAME']}</p>  
-                            <p><strong>Commencement:</strong> {row['COMMENCEMENT']}</p> 
-                        </div>
-                    """, unsafe_allow_html=True)
-                with col2:
-                    st.markdown(f"""
-                        <div class="detail-section">
-                            <p><strong>Rent PSF:</strong> ₹{row['RENT PSF']}</p>
-                            <p><strong>Lease Rent:</strong> ₹{row['LEASE RENT']}</p>
-                            <p><strong>Security:</strong> {row['SECURITY']}</p>
-                            <p><strong>Term:</strong> {row['TERM']}</p>
-                        </div>
-                    """, unsafe_allow_html=True)
-                st.markdown(f"""
-                    <div class="additional-details">
-                        <p><strong>Lock-in Period:</strong> {row['LOCKIN']}</p>
-                        <p><strong>Increment:</strong> {row['INCREMENT']}</p>
-                        <p><strong>Return:</strong> {row['RETURN']}</p>
-                        <p><strong>Offered By:</strong> {row['OFFERED BY']}</p>
-                    </div>
-                """, unsafe_allow_html=True)
+        with filter_panel("rented"):
+            query = search_input()
+
+            # Price Filters
+            col1, col2 = st.columns(2)
+            with col1:
+                min_price = int(df['rent_psf'].min())
+                max_price = int(df['rent_psf'].max())
+
+                price_col1, price_col2 = st.columns(2)
+                with price_col1:
+                    min_price_input = st.number_input("Min Price (PSF) (₹)",
+                                                      min_value=min_price,
+                                                      max_value=max_price,
+                                                      value=min_price)
+                with price_col2:
+                    max_price_input = st.number_input("Max Price (PSF) (₹)",
+                                                      min_value=min_price,
+                                                      max_value=max_price,
+                                                      value=max_price)
+
+            # Dropdowns show how many listings each option leaves, given the other filters
+            ranges = {
+                "rent_psf": (min_price_input, max_price_input),
+            }
+            facets = Facets(
+                listings, "rented",
+                ["category", "property_type", "configuration", "facing", "location", "reference"],
+                ranges=ranges, text=query,
+            )
+
+            # Property Filters
+            col3, col4 = st.columns(2)
+            with col3:
+                selected_category = facets.selectbox("Category", "category")
+                selected_type = facets.selectbox("Property Type", "property_type")
+            with col4:
+                selected_configuration = facets.selectbox("Configuration", "configuration")
+                selected_facing = facets.selectbox("Facing", "facing")
+
+            # Location and Reference Filters
+            col5, col6 = st.columns(2)
+            with col5:
+                selected_location = facets.selectbox("Location", "location")
+            with col6:
+                selected_ref = facets.selectbox("Reference", "reference")
+
+            st.markdown('</div>', unsafe_allow_html=True)
+
+            # Filtering Logic: every filter goes into one spec, evaluated in a single pass
+            sort = sort_selectbox("rent_psf", size_field=None)
+        spec = filter_spec(
+            equals={
+                "category": selected_category,
+                "location": selected_location,
+                "property_type": selected_type,
+                "configuration": selected_configuration,
+                "facing": selected_facing,
+                "reference": selected_ref,
+            },
+            ranges=ranges,
+            sort=sort,
+            text=query,
+        )
+
+        # Results: counter, page controls, detail pane and cards, in a fragment of their own
+        show_results("Rented", spec, "Premium Properties Found", CARD_TEMPLATE, DETAIL_TEMPLATE,
+                     ("COMPANY NAME", "BUILDING"), price_field="rent_psf")
 
     else:
         st.error("Unable to load rented property data. Please try again later.")
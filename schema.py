@@ -0,0 +1,144 @@
+# schema.py
+from collections import namedtuple
+
+from parsing import SQ_FT, SQ_YD
+
+# Field kinds: TEXT is kept as the sheet has it and filtered by value; NOTE is
+# free text kept as the sheet has it, only ever searched; PRICE (rupees) and AREA
+# (in the field's unit, the one its page shows) are parsed into numbers
+TEXT = "text"
+NOTE = "note"
+PRICE = "price"
+AREA = "area"
+NUMERIC = (PRICE, AREA)
+
+# One logical field of a category sheet. The column is found by header name
+# (case and spacing ignored, first match wins) and, when none of the names is
+# in the header, by the 0-based position the pages have always read it from
+# (None for columns the pages never read by position).
+Field = namedtuple("Field", ["name", "kind", "headers", "position", "unit"], defaults=(None,))
+
+SCHEMAS = {
+    "Kothi": [
+        Field("location", TEXT, ("LOCATION",), 2),
+        Field("block", TEXT, ("BLOCK",), 3),
+        Field("size", AREA, (), 5, SQ_FT),
+        Field("deal_type", TEXT, (), 11),
+        Field("kothi_type", NOTE, ("KOTHI TYPE",), None),
+        Field("description", NOTE, ("DESCRIPTION",), None),
+        Field("rent", PRICE, (), 19),
+        Field("sale_price", PRICE, (), 21),
+        Field("profile", TEXT, ("PROFILE",), 24),
+        Field("reference", TEXT, (), 25),
+    ],
+    "Apartment": [
+        Field("micro_market", TEXT, (), 2),
+        Field("location", TEXT, ("LOCATION",), 3),
+        Field("project", TEXT, (), 4),
+        Field("size", AREA, (), 5, SQ_FT),
+        Field("accommodation", TEXT, (), 6),
+        Field("tower", NOTE, ("TOWER",), None),
+        Field("description", NOTE, ("DESCRIPTION",), None),
+        Field("deal_type", TEXT, (), 14),
+        Field("rent", PRICE, (), 15),
+        Field("sale_price", PRICE, (), 17),
+        Field("profile", TEXT, ("PROFILE",), 21),
+        Field("reference", TEXT, (), 22),
+    ],
+    "Floor": [
+        Field("location", TEXT, ("LOCATION",), 2),
+        Field("block", TEXT, ("BLOCK",), 3),
+        Field("size", AREA, (), 5, SQ_FT),
+        Field("accommodation", TEXT, (), 7),
+        Field("description", NOTE, ("DESCRIPTION",), None),
+        Field("deal_type", TEXT, (), 10),
+        Field("facing", TEXT, ("FACING",), 11),
+        Field("rent", PRICE, (), 18),
+        Field("sale_price", PRICE, (), 20),
+        Field("profile", TEXT, (), 25),
+        Field("reference", TEXT, ("REF",), 26),
+    ],
+    "Plot": [
+        Field("location", TEXT, ("LOCATION",), 2),
+        Field("block", TEXT, ("BLOCK",), 3),
+        Field("size", AREA, (), 5, SQ_YD),
+        Field("sale_price", PRICE, (), 9),
+        Field("description", NOTE, ("DESCRIPTION",), None),
+        Field("profile", TEXT, ("PROFILE",), 14),
+        Field("reference", TEXT, ("REF",), 15),
+    ],
+    "Rented": [
+        Field("category", TEXT, (), 0),
+        Field("location", TEXT, ("LOCATION",), 2),
+        Field("property_type", TEXT, (), 3),
+        Field("building", NOTE, ("BUILDING",), None),
+        Field("company", NOTE, ("COMPANY NAME",), None),
+        Field("configuration", TEXT, (), 6),
+        Field("facing", TEXT, (), 7),
+        Field("rent_psf", PRICE, (), 12),
+        Field("reference", TEXT, (), 14),
+    ],
+    "Retail": [
+        Field("location", TEXT, ("LOCATION",), 2),
+        Field("project", TEXT, ("PROJECT",), 3),
+        Field("size", AREA, (), 4, SQ_FT),
+        Field("tower", NOTE, ("TOWER/BLOCK",), None),
+        Field("description", NOTE, ("DESCRIPTION",), None),
+        Field("deal_type", TEXT, (), 11),
+        Field("rent", PRICE, (), 12),
+        Field("sale_price", PRICE, (), 13),
+        Field("profile", TEXT, ("PROFILE",), 21),
+        Field("reference", TEXT, ("REF",), 22),
+    ],
+    "Office": [
+        Field("location", TEXT, ("LOCATION",), 2),
+        Field("project", TEXT, ("PROJECT",), 3),
+        Field("size", AREA, (), 4, SQ_FT),
+        Field("tower", NOTE, ("TOWER/BLOCK",), None),
+        Field("deal_type", TEXT, (), 11),
+        Field("rent", PRICE, (), 12),
+        Field("sale_price", PRICE, (), 13),
+        Field("profile", TEXT, ("PROFILE",), 21),
+        Field("reference", TEXT, ("REF",), 22),
+    ],
+}
+
+# Dropdowns that narrow each other, outermost first: choosing a value lists only
+# the values of the later fields found under it
+HIERARCHIES = {
+    "Kothi": ("location", "block"),
+    "Apartment": ("micro_market", "location", "project"),
+    "Floor": ("location", "block"),
+    "Plot": ("location", "block"),
+    "Retail": ("location", "project"),
+    "Office": ("location", "project"),
+}
+
+# Text fields the search box looks through
+SEARCH_FIELDS = {
+    "Kothi": ("description", "location", "block", "kothi_type"),
+    "Apartment": ("description", "micro_market", "location", "project", "tower"),
+    "Floor": ("description", "location", "block"),
+    "Plot": ("description", "location", "block"),
+    "Rented": ("company", "building", "location", "category", "property_type"),
+    "Retail": ("description", "location", "project", "tower"),
+    "Office": ("location", "project", "tower"),
+}
+
+
+def _normalize_header(name):
+    return " ".join(str(name).split()).upper()
+
+
+def resolve_schema(sheet_name, header):
+    # Field name -> (field, 0-based position) for every field of the sheet found in the header
+    positions = {}
+    normalized = [_normalize_header(name) for name in header]
+    for field in SCHEMAS.get(sheet_name, []):
+        names = [_normalize_header(name) for name in field.headers]
+        position = next((i for i, name in enumerate(normalized) if name in names), None)
+        if position is None and field.position is not None and field.position < len(header):
+            position = field.position
+        if position is not None:
+            positions[field.name] = (field, position)
+    return positions
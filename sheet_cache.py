@@ -0,0 +1,21 @@
+# sheet_cache.py
+from counting_cache import CountingCache, CountingTTLCache
+
+
+class SheetCache(CountingCache):
+    """Thread-safe TTL/LRU cache of sheet rows shared by every Streamlit session."""
+
+    def __init__(self, ttl, max_entries):
+        super().__init__(CountingTTLCache(maxsize=max_entries, ttl=ttl))
+
+    def invalidate(self, key=None):
+        # Drop one entry, or everything when no key is given
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.expire()
+                self._entries.pop(key, None)
+
+    def stats(self):
+        return {**super().stats(), "ttl": self._entries.ttl}
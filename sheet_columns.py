@@ -0,0 +1,75 @@
+# sheet_columns.py
+from schema import resolve_schema
+
+# Columns each category page shows besides its schema fields (see schema.py), by
+# header name or 0-based position. "card" covers the result cards; "detail" is
+# only needed for the expanded details of a listing. Anything else in the sheet
+# (notes and other working columns) is never downloaded.
+SHEET_COLUMNS = {
+    "Kothi": {
+        "card": ["LOCATION", "BLOCK", "Kothi type", "FACING", "AVAILABLE / UNAVAILABLE"],
+        "detail": ["DATE", "NO.", "FLOORS", "Accom.", "OLD / NEW", "LIFT", "STILT", "POOL",
+                   "PB", "HOME THEATER", "OFFERED BY", "PROFILE"],
+    },
+    "Apartment": {
+        "card": ["TOWER", "FLOOR", "AVAILABLE / UNAVAILABLE"],
+        "detail": ["DATE", "LOCATION", "UNIT NO.", "DESCRIPTION", "CAR PARKING", "MAINTENANCE",
+                   "OFFERED BY", "PROFILE"],
+    },
+    "Floor": {
+        "card": ["LOCATION", "BLOCK", "FLOORS AVAIL", "NO.", "AVAILABLE / UNAVAILABLE"],
+        "detail": ["DATE", "DESCRIPTION", "FACING", "OLD / NEW", "LIFT", "STILT", "BACKUP",
+                   "OFFERED BY", "NUMBER", "REF"],
+    },
+    "Plot": {
+        "card": ["LOCATION", "BLOCK", "PLOT NO", "ROAD WIDTH", "AVAILABLE / UNAVAILABLE"],
+        "detail": ["DATE", "DOC. CHARGES", "OTHER CHARGES", "OFFERED BY", "NUMBER", "PROFILE",
+                   "REF", "DESCRIPTION"],
+    },
+    "Rented": {
+        "card": ["COMPANY NAME", "BUILDING", "AREA (IN SQ.FT.) (A/T)", "UNIT NO.", "FLOOR",
+                 "LOCATION"],
+        "detail": ["DATE", "COMMENCEMENT", "RENT PSF", "LEASE RENT", "SECURITY", "TERM",
+                   "LOCKIN", "INCREMENT", "RETURN", "OFFERED BY"],
+    },
+    "Retail": {
+        "card": ["PROJECT", "LOCATION", "FLOOR", "UNIT NO."],
+        "detail": ["DATE", "TOWER/BLOCK", "MAINTENANCE", "DESCRIPTION", "OFFERED BY", "PROFILE",
+                   "REF"],
+    },
+    "Office": {
+        "card": ["PROJECT", "LOCATION", "FLOOR", "UNIT NO.", "AVAILABLE / UNAVAILABLE"],
+        "detail": ["DATE", "TOWER/BLOCK", "FURNISHED / WARMSHELL / BTS", "MAINTENANCE",
+                   "OFFERED BY", "PROFILE", "REF", "NUMBER"],
+    },
+}
+
+
+def resolve_columns(header, columns):
+    # Header names (first match wins) and positions -> set of positions; unknown names are skipped
+    positions = set()
+    for column in columns:
+        if isinstance(column, int):
+            positions.add(column)
+        elif column in header:
+            positions.add(header.index(column))
+    return positions
+
+
+def view_columns(sheet_name, header, include_detail):
+    # Positions to read for a page, or None when the sheet declares nothing and is read whole
+    declared = SHEET_COLUMNS.get(sheet_name)
+    if declared is None:
+        return None
+    positions = {position for _, position in resolve_schema(sheet_name, header).values()}
+    positions |= resolve_columns(header, declared["card"])
+    if include_detail:
+        positions |= resolve_columns(header, declared["detail"])
+    return tuple(sorted(positions))
+
+
+def detail_columns(sheet_name, header):
+    declared = SHEET_COLUMNS.get(sheet_name)
+    if declared is None:
+        return set()
+    return resolve_columns(header, declared["detail"])
@@ -0,0 +1,188 @@
+# sheets_client.py
+import queue
+import threading
+from contextlib import contextmanager
+
+import httplib2
+import google_auth_httplib2
+from google.auth.exceptions import TransportError
+from google.oauth2.service_account import Credentials
+from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+from tenacity import Retrying, retry_if_exception, stop_after_attempt, wait_random_exponential
+
+from config import (
+    SPREADSHEET_ID,
+    SHEETS_CREDENTIALS_FILE,
+    SHEETS_HTTP_POOL_SIZE,
+    SHEETS_HTTP_TIMEOUT,
+    SHEETS_READS_PER_MINUTE,
+    SHEETS_READ_BURST,
+    SHEETS_RETRY_ATTEMPTS,
+    SHEETS_RETRY_MAX_WAIT,
+)
+from rate_limiter import TokenBucket
+
+SCOPES = ["https://www.googleapis.com/auth/spreadsheets.readonly"]
+
+# Quota exceeded or a server-side hiccup; anything else (403, 404, bad range) fails at once
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def _is_transient(error):
+    if isinstance(error, HttpError):
+        return error.resp.status in RETRY_STATUSES
+    return isinstance(error, (TimeoutError, ConnectionError, httplib2.HttpLib2Error, TransportError))
+
+
+def column_letter(number):
+    # 1 -> "A", 26 -> "Z", 27 -> "AA"
+    letters = ""
+    while number > 0:
+        number, remainder = divmod(number - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
+
+
+def column_spans(positions):
+    # Sorted 0-based positions -> inclusive (first, last) runs, merging overlapping and adjacent ones
+    spans = []
+    for position in sorted(set(positions)):
+        if spans and position <= spans[-1][1] + 1:
+            spans[-1][1] = max(spans[-1][1], position)
+        else:
+            spans.append([position, position])
+    return [tuple(span) for span in spans]
+
+
+def quote_sheet(sheet_name):
+    return "'" + sheet_name.replace("'", "''") + "'"
+
+
+def span_range(sheet_name, first, last, start_row=1):
+    # Columns first..last (0-based) from start_row to the end of the sheet, e.g. 'Floor'!C2:F
+    return f"{quote_sheet(sheet_name)}!{column_letter(first + 1)}{start_row}:{column_letter(last + 1)}"
+
+
+class SheetsClient:
+    """One set of credentials and one Sheets service shared by every session thread."""
+
+    def __init__(self, spreadsheet_id, credentials_file, pool_size, timeout,
+                 reads_per_minute, read_burst, retry_attempts, retry_max_wait):
+        self.spreadsheet_id = spreadsheet_id
+        self._credentials = Credentials.from_service_account_file(credentials_file, scopes=SCOPES)
+        self._service = build("sheets", "v4", credentials=self._credentials, cache_discovery=False)
+        self._refresh_lock = threading.Lock()
+        self._timeout = timeout
+        # httplib2.Http is not thread-safe, so each request borrows its own
+        # connection and hands it back afterwards to keep it alive for the next one
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+        # Every thread draws from one bucket, so the whole process stays inside the read quota
+        self._bucket = TokenBucket(reads_per_minute / 60, read_burst)
+        self._retry_attempts = retry_attempts
+        self._retry_max_wait = retry_max_wait
+        self._stats_lock = threading.Lock()
+        self._stats = {"requests": 0, "throttled": 0, "retried": 0, "failed": 0}
+
+    @contextmanager
+    def _connection(self):
+        try:
+            http = self._pool.get_nowait()
+        except queue.Empty:
+            http = google_auth_httplib2.AuthorizedHttp(
+                self._credentials, http=httplib2.Http(timeout=self._timeout)
+            )
+        try:
+            yield http
+        finally:
+            try:
+                self._pool.put_nowait(http)
+            except queue.Full:
+                http.close()
+
+    def _ensure_token(self, http):
+        # Exchange a new OAuth token only once it has expired, and only in one thread
+        with self._refresh_lock:
+            if not self._credentials.valid:
+                self._credentials.refresh(google_auth_httplib2.Request(http.http))
+
+    def _count(self, name):
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def stats(self):
+        # requests: attempts sent; throttled: attempts held back by the bucket or answered 429;
+        # retried: attempts repeated after a transient error; failed: requests that gave up
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def _attempt(self, request):
+        if self._bucket.acquire():
+            self._count("throttled")
+        self._count("requests")
+        try:
+            with self._connection() as http:
+                self._ensure_token(http)
+                return request.execute(http=http)
+        except HttpError as error:
+            if error.resp.status == 429:
+                self._count("throttled")
+            raise
+
+    def execute(self, request):
+        # Transient errors are retried with jittered exponential backoff
+        retrying = Retrying(
+            retry=retry_if_exception(_is_transient),
+            wait=wait_random_exponential(multiplier=1, max=self._retry_max_wait),
+            stop=stop_after_attempt(self._retry_attempts),
+            before_sleep=lambda retry_state: self._count("retried"),
+            reraise=True,
+        )
+        try:
+            return retrying(self._attempt, request)
+        except Exception:
+            self._count("failed")
+            raise
+
+    def get_values(self, range_name):
+        request = self._service.spreadsheets().values().get(
+            spreadsheetId=self.spreadsheet_id, range=range_name
+        )
+        return self.execute(request).get("values", [])
+
+    def batch_get_values(self, range_names):
+        # One round trip for several ranges; value ranges come back in request order
+        request = self._service.spreadsheets().values().batchGet(
+            spreadsheetId=self.spreadsheet_id, ranges=list(range_names)
+        )
+        value_ranges = self.execute(request).get("valueRanges", [])
+        return [value_range.get("values", []) for value_range in value_ranges]
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_sheets_client():
+    # Built on first use so importing the app does not touch the key file
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = SheetsClient(
+                SPREADSHEET_ID,
+                SHEETS_CREDENTIALS_FILE,
+                SHEETS_HTTP_POOL_SIZE,
+                SHEETS_HTTP_TIMEOUT,
+                SHEETS_READS_PER_MINUTE,
+                SHEETS_READ_BURST,
+                SHEETS_RETRY_ATTEMPTS,
+                SHEETS_RETRY_MAX_WAIT,
+            )
+        return _client
+
+
+def get_sheets_api_stats():
+    # Zeros until the first Google request, and for the local data sources
+    if _client is None:
+        return {"requests": 0, "throttled": 0, "retried": 0, "failed": 0}
+    return _client.stats()
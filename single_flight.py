@@ -0,0 +1,67 @@
+# single_flight.py
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time; concurrent callers for a key share its result.
+
+    ``do(keys, fn)`` calls ``fn(owned_keys)`` for the keys nobody else is fetching
+    and waits for the rest. ``fn`` returns a result per owned key, in order. An
+    error raised by ``fn`` is raised again in every caller that was waiting on it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.calls = 0
+        self.shared = 0
+
+    def do(self, keys, fn):
+        keys = list(keys)
+        owned = []
+        calls = {}
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                call = self._calls.get(key)
+                if call is None:
+                    call = self._calls[key] = _Call()
+                    owned.append(key)
+                else:
+                    self.shared += 1
+                calls[key] = call
+            self.calls += len(owned)
+
+        if owned:
+            try:
+                for key, result in zip(owned, fn(owned)):
+                    calls[key].result = result
+            except BaseException as error:
+                for key in owned:
+                    calls[key].error = error
+                raise
+            finally:
+                with self._lock:
+                    for key in owned:
+                        del self._calls[key]
+                for key in owned:
+                    calls[key].done.set()
+
+        results = []
+        for key in keys:
+            call = calls[key]
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            results.append(call.result)
+        return results
+
+    def stats(self):
+        with self._lock:
+            return {"calls": self.calls, "shared": self.shared, "in_flight": len(self._calls)}
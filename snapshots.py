@@ -0,0 +1,49 @@
+# snapshots.py
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+
+import pyarrow.parquet as pq
+
+from data_sources import rows_to_table, table_to_rows, normalize_row
+
+# A sheet's rows (header first), the time they were read from the source, and
+# the column positions that were read (None when the whole sheet was)
+SheetSnapshot = namedtuple("SheetSnapshot", ["key", "data", "fetched_at", "columns"], defaults=(None,))
+
+
+class SnapshotStore:
+    """Last good copy of each sheet as a Parquet file, stamped with its fetch time."""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def path_for(self, key):
+        return os.path.join(self.directory, f"{key}.parquet")
+
+    def save(self, key, data, fetched_at=None, columns=None):
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        table = rows_to_table(data).replace_schema_metadata({
+            "fetched_at": repr(fetched_at),
+            "columns": json.dumps(None if columns is None else list(columns)),
+        })
+        os.makedirs(self.directory, exist_ok=True)
+        # Write then rename, so a reader never sees a half-written file
+        path = self.path_for(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
+        return SheetSnapshot(key, data, fetched_at, columns)
+
+    def load(self, key):
+        path = self.path_for(key)
+        if not os.path.exists(path):
+            return None
+        table = pq.ParquetFile(path).read()
+        metadata = table.schema.metadata or {}
+        fetched_at = float(metadata.get(b"fetched_at", os.path.getmtime(path)))
+        columns = json.loads(metadata.get(b"columns", b"null"))
+        data = [normalize_row(row) for row in table_to_rows(table)]
+        return SheetSnapshot(key, data, fetched_at, None if columns is None else tuple(columns))